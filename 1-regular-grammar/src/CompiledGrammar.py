@@ -0,0 +1,65 @@
+import numpy as np
+
+
+class CompiledGrammar:
+    # Dense DFA for a right-linear grammar. Rows are DFA states (the last row
+    # is the sink), columns are the alphabet symbols followed by two extra
+    # columns: one for characters outside the alphabet and one for padding.
+    def __init__(self, symbols, rows, accepting):
+        self.symbols = symbols
+        self.symbol_index = {symbol: i for i, symbol in enumerate(symbols)}
+        self.unknown_column = len(symbols)
+        self.pad_column = len(symbols) + 1
+
+        self.sink = len(rows)
+        self.start = 0
+        self.table = np.empty((len(rows) + 1, len(symbols) + 2), dtype=np.int32)
+        for state, row in enumerate(rows):
+            self.table[state, :len(symbols)] = [self.sink if target is None else target for target in row]
+        self.table[:, self.unknown_column] = self.sink
+        self.table[self.sink, :] = self.sink
+        self.table[:, self.pad_column] = np.arange(len(rows) + 1, dtype=np.int32)
+
+        self.accepting = np.zeros(len(rows) + 1, dtype=bool)
+        self.accepting[accepting] = True
+
+        # Code point -> column lookup, used to encode whole batches at once
+        max_code = max((ord(symbol) for symbol in symbols), default=0)
+        self.code_lookup = np.full(max_code + 1, self.unknown_column, dtype=np.int32)
+        for symbol, column in self.symbol_index.items():
+            self.code_lookup[ord(symbol)] = column
+
+    def encode(self, strings):
+        # Padded (n, max_len) matrix of column indices. Positions past the
+        # end of each string get the pad column; the lengths are kept
+        # explicitly, so a real NUL character is just an unknown symbol.
+        strings = list(strings)
+        lengths = np.fromiter(map(len, strings), dtype=np.intp, count=len(strings))
+        width = int(lengths.max(initial=0))
+        inside = np.arange(width) < lengths[:, None]
+
+        codes = np.zeros(inside.shape, dtype=np.uint32)
+        codes[inside] = np.frombuffer("".join(strings).encode('utf-32-le'), dtype=np.uint32)
+        in_range = codes < len(self.code_lookup)
+        columns = self.code_lookup[np.where(in_range, codes, 0)]
+        columns[~in_range] = self.unknown_column
+        columns[~inside] = self.pad_column
+        return columns
+
+    def run(self, encoded):
+        states = np.full(encoded.shape[0], self.start, dtype=np.int32)
+        for position in range(encoded.shape[1]):
+            states = self.table[states, encoded[:, position]]
+        return states
+
+    def match(self, word):
+        state = self.start
+        for ch in word:
+            column = self.symbol_index.get(ch, self.unknown_column)
+            state = self.table[state, column]
+            if state == self.sink:
+                return False
+        return bool(self.accepting[state])
+
+    def match_many(self, strings):
+        return self.accepting[self.run(self.encode(strings))]
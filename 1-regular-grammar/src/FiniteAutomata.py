@@ -5,6 +5,7 @@ class FiniteAutomata:
         self.parsed_grammar = self.parseGrammar(grammar_str)
         self.start_symbol = None
         self.end_symbols = []
+        self._transitions = None
 
     def setStartSymbol(self, start_symbol):
         self.start_symbol = start_symbol
@@ -33,26 +34,59 @@ class FiniteAutomata:
                         productions[nt].append((prod[0], prod[1:]))
         return productions
 
-    def checkStr(self, check_str):
-        def rec(nt, i):
-            if i == len(check_str):
-                return self._canDeriveEpsilon(nt)
+    def _buildTransitions(self):
+        # nt -> terminal -> (set of next non-terminals, whether a terminal-only
+        # production ends the word here)
+        transitions = {}
+        for nt, prods in self.parsed_grammar.items():
+            by_terminal = transitions.setdefault(nt, {})
+            for terminal, next_nt in prods:
+                next_nts, can_end = by_terminal.get(terminal, (set(), False))
+                if next_nt is None:
+                    can_end = True
+                else:
+                    next_nts.add(next_nt)
+                by_terminal[terminal] = (next_nts, can_end)
+        return transitions
 
-            for prod in self.parsed_grammar.get(nt, []):
-                terminal, next_nt = prod
+    def _getTransitions(self):
+        if self._transitions is None:
+            self._transitions = self._buildTransitions()
+        return self._transitions
 
-                if i < len(check_str) and check_str[i] == terminal:
-                    if next_nt is None:
-                        if i + 1 == len(check_str):
-                            return True
-                    else:
-                        if rec(next_nt, i + 1):
-                            return True
+    def checkStr(self, check_str):
+        if not self.start_symbol:
             return False
+        return self._run(self._getTransitions(), check_str)
 
+    def check_many(self, strings):
         if not self.start_symbol:
-            return False
-        return rec(self.start_symbol, 0)
+            return [False for _ in strings]
+        transitions = self._getTransitions()
+        return [self._run(transitions, s) for s in strings]
+
+    def _run(self, transitions, check_str):
+        # Advance the set of live non-terminals one character at a time, so
+        # each (non-terminal, index) pair is visited at most once.
+        live = {self.start_symbol}
+        ended = False
+
+        for ch in check_str:
+            if not live:
+                return False
+            next_live = set()
+            ended = False
+            for nt in live:
+                step = transitions.get(nt, {}).get(ch)
+                if step is not None:
+                    next_nts, can_end = step
+                    next_live |= next_nts
+                    ended = ended or can_end
+            live = next_live
+
+        if ended:
+            return True
+        return any(self._canDeriveEpsilon(nt) for nt in live)
 
     def _canDeriveEpsilon(self, nt):
         return False
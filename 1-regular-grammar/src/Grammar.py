@@ -1,4 +1,4 @@
-from collections import defaultdict
+from collections import defaultdict, deque
 
 class Grammar:
     def __init__(self, grammar_str):
@@ -37,24 +37,142 @@ class Grammar:
         for non_terminal, productions in self.parsed_grammar.items():
             print(f"{non_terminal}: {productions}")
 
+    def _determinize(self):
+        # Subset construction over the right-linear productions. A
+        # terminal-only production moves to the accepting marker None.
+        # Returns (symbols, rows, accepting) where rows[state][i] is the
+        # target state on symbols[i], or None when there is no move.
+        if not self.start_symbol:
+            # No start symbol: a single state that accepts nothing
+            return [], [[]], []
+        symbols = sorted({terminal for prods in self.parsed_grammar.values() for terminal, _ in prods})
+        symbol_index = {symbol: i for i, symbol in enumerate(symbols)}
+        initial = frozenset([self.start_symbol])
+        state_ids = {initial: 0}
+        rows = []
+        accepting = []
+        worklist = deque([initial])
+
+        while worklist:
+            current = worklist.popleft()
+            moves = [set() for _ in symbols]
+            for nt in current:
+                if nt is None:
+                    continue
+                for terminal, next_nt in self.parsed_grammar.get(nt, []):
+                    moves[symbol_index[terminal]].add(next_nt)
+
+            row = []
+            for targets in moves:
+                if not targets:
+                    row.append(None)
+                    continue
+                targets = frozenset(targets)
+                if targets not in state_ids:
+                    state_ids[targets] = len(state_ids)
+                    worklist.append(targets)
+                row.append(state_ids[targets])
+
+            rows.append(row)
+            if None in current:
+                accepting.append(state_ids[current])
+
+        return symbols, rows, accepting
+
+    def compile(self):
+        from src.CompiledGrammar import CompiledGrammar  # requires numpy
+        return CompiledGrammar(*self._determinize())
+
+    def iter_strings(self, order="length"):
+        # Yields every word of the language exactly once, shortest first and
+        # alphabetically within a length. Words are read off a DFA, so two
+        # paths never spell the same word, and a prefix is only extended when
+        # it can still be completed to the target length, so every step of
+        # the search ends in an emitted word.
+        if order != "length":
+            raise ValueError(f"Unsupported order: {order}")
+        if not self.start_symbol:
+            return
+
+        symbols, rows, accepting = self._determinize()
+        edges = [[(symbols[i], target) for i, target in enumerate(row) if target is not None] for row in rows]
+
+        # can_finish[r] = states that reach an accepting state in exactly r steps
+        can_finish = [set(accepting)]
+        max_length = None if self._hasUsefulCycle(edges, accepting) else len(rows)
+
+        length = 0
+        while max_length is None or length < max_length:
+            if length > 0:
+                previous = can_finish[length - 1]
+                can_finish.append({state for state, out in enumerate(edges)
+                                   if any(target in previous for _, target in out)})
+            if 0 in can_finish[length]:
+                yield from self._iterWordsOfLength(edges, can_finish, length)
+            length += 1
+
+    def _iterWordsOfLength(self, edges, can_finish, length):
+        word = []
+        stack = [(0, iter(edges[0]))]
+        if length == 0:
+            yield ""
+            return
+
+        while stack:
+            state, moves = stack[-1]
+            remaining = length - len(word) - 1
+            for symbol, target in moves:
+                if target in can_finish[remaining]:
+                    word.append(symbol)
+                    if remaining == 0:
+                        yield "".join(word)
+                        word.pop()
+                        continue
+                    stack.append((target, iter(edges[target])))
+                    break
+            else:
+                stack.pop()
+                if word:
+                    word.pop()
+
+    def _hasUsefulCycle(self, edges, accepting):
+        # The language is infinite iff a cycle passes through states that
+        # can still reach an accepting state.
+        reverse = defaultdict(list)
+        for state, out in enumerate(edges):
+            for _, target in out:
+                reverse[target].append(state)
+        productive = set(accepting)
+        worklist = deque(accepting)
+        while worklist:
+            state = worklist.popleft()
+            for source in reverse[state]:
+                if source not in productive:
+                    productive.add(source)
+                    worklist.append(source)
+
+        # Kahn's algorithm on the productive sub-graph; leftovers lie on a cycle
+        in_degree = {state: 0 for state in productive}
+        for state in productive:
+            for _, target in edges[state]:
+                if target in productive:
+                    in_degree[target] += 1
+        worklist = deque(state for state, degree in in_degree.items() if degree == 0)
+        removed = 0
+        while worklist:
+            state = worklist.popleft()
+            removed += 1
+            for _, target in edges[state]:
+                if target in productive:
+                    in_degree[target] -= 1
+                    if in_degree[target] == 0:
+                        worklist.append(target)
+        return removed < len(productive)
+
     def getStrings(self, max_count=10, max_depth=10):
-        result_strs = set()
-
-        def rec(nt, current, depth):
-            if depth > max_depth or len(result_strs) >= max_count:
-                return
-
-            for prod in self.parsed_grammar.get(nt, []):
-                terminal, next_nt = prod
-                new_str = current + terminal
-
-                if next_nt is None:
-                    result_strs.add(new_str)
-                    if len(result_strs) >= max_count:
-                        return
-                else:
-                    rec(next_nt, new_str, depth + 1)
-
-        if self.start_symbol:
-            rec(self.start_symbol, "", 0)
-        return list(result_strs)
+        result_strs = []
+        for word in self.iter_strings():
+            if len(word) > max_depth + 1 or len(result_strs) >= max_count:
+                break
+            result_strs.append(word)
+        return result_strs
@@ -1,7 +1,8 @@
 # test_formal_language.py
+import itertools
 import unittest
 from src.Grammar import Grammar
-from src.Finite_Automata import FiniteAutomata
+from src.FiniteAutomata import FiniteAutomata
 
 class TestFormalLanguage(unittest.TestCase):
     def setUp(self):
@@ -34,5 +35,49 @@ class TestFormalLanguage(unittest.TestCase):
         self.assertFalse(self.automaton.checkStr("zzz"))
         self.assertFalse(self.automaton.checkStr("abcabc"))
 
+    def test_check_many(self):
+        self.assertEqual(self.automaton.check_many(["abac", "zzz", "aac", ""]),
+                         [True, False, True, False])
+
+    def test_automaton_handles_long_strings(self):
+        long_str = "a" + "b" * 5000 + "ac"
+        self.assertTrue(self.automaton.checkStr(long_str))
+        self.assertFalse(self.automaton.checkStr(long_str + "a"))
+
+    def test_compiled_grammar_matches_automaton(self):
+        try:
+            compiled = self.grammar.compile()
+        except ImportError:
+            self.skipTest("numpy is not installed")
+        strings = self.grammar.getStrings() + ["zzz", "abcabc", "", "ab"]
+        self.assertEqual(list(compiled.match_many(strings)),
+                         self.automaton.check_many(strings))
+
+    def test_compiled_grammar_treats_nul_as_a_character(self):
+        try:
+            compiled = self.grammar.compile()
+        except ImportError:
+            self.skipTest("numpy is not installed")
+        word = self.grammar.getStrings()[0]
+        strings = [word, word + "\x00", "\x00" + word, "\x00", word + "\U0001F600", ""]
+        self.assertEqual(list(compiled.match_many(strings)),
+                         [compiled.match(string) for string in strings])
+        self.assertEqual(list(compiled.match_many(strings))[:4], [True, False, False, False])
+
+    def test_compiled_grammar_without_start_symbol_accepts_nothing(self):
+        try:
+            compiled = Grammar(self.production).compile()
+        except ImportError:
+            self.skipTest("numpy is not installed")
+        self.assertFalse(compiled.match(""))
+        self.assertEqual(list(compiled.match_many(["", "a", "aac"])), [False, False, False])
+
+    def test_iter_strings_shortest_first_without_duplicates(self):
+        words = list(itertools.islice(self.grammar.iter_strings(), 200))
+        self.assertEqual(len(words), len(set(words)))
+        self.assertEqual([len(w) for w in words], sorted(len(w) for w in words))
+        self.assertEqual(words[0], "aac")
+        self.assertTrue(all(self.automaton.check_many(words)))
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,88 @@
+from array import array
+from collections import OrderedDict
+
+
+class TableRunner:
+    # Flat array-backed transition table for a deterministic automaton:
+    # table[state * width + symbol] is the next state id, or -1 for no move
+    def __init__(self, index, initial_state, final_state):
+        self.symbol_ids = dict(index.symbol_ids)
+        self.width = max(len(index.symbol_names), 1)
+        self.table = array('l', [-1]) * (len(index.state_names) * self.width)
+        for (state_id, symbol_id), targets in index.targets.items():
+            self.table[state_id * self.width + symbol_id] = targets[0]
+
+        self.start = index.state_ids[initial_state]
+        self.final = bytearray(len(index.state_names))
+        for state in final_state:
+            if state in index.state_ids:
+                self.final[index.state_ids[state]] = 1
+
+    def accepts(self, word):
+        table = self.table
+        width = self.width
+        symbol_ids = self.symbol_ids
+        state = self.start
+        for symbol in word:
+            symbol_id = symbol_ids.get(symbol)
+            if symbol_id is None:
+                return False
+            state = table[state * width + symbol_id]
+            if state < 0:
+                return False
+        return self.final[state] == 1
+
+
+class LazyDFARunner:
+    # On-the-fly subset simulation. NFA state sets are sorted tuples of state
+    # ids, stepped straight from the transition index when first needed.
+    # Epsilon closures of single states are cached as they come up, and the
+    # DFA transitions discovered so far are kept in a bounded LRU cache, so
+    # nothing is determinized up front.
+    def __init__(self, index, initial_state, final_state, cache_size=65536):
+        self.index = index
+        self.symbol_ids = dict(index.symbol_ids)
+        self.closures = {}
+        self.start = self.closure(index.state_ids[initial_state])
+        self.final_ids = {index.state_ids[state] for state in final_state if state in index.state_ids}
+        self.cache = OrderedDict()
+        self.cache_size = cache_size
+
+    def closure(self, state_id):
+        closure = self.closures.get(state_id)
+        if closure is None:
+            closure = self.index.epsilon_closure(state_id)
+            self.closures[state_id] = closure
+        return closure
+
+    def next_states(self, states, symbol_id):
+        key = (states, symbol_id)
+        cache = self.cache
+        next_states = cache.get(key)
+        if next_states is not None:
+            cache.move_to_end(key)
+            return next_states
+
+        get = self.index.get
+        reached = set()
+        for state_id in states:
+            for to in get(state_id, symbol_id):
+                reached.update(self.closure(to))
+        next_states = tuple(sorted(reached))
+
+        cache[key] = next_states
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return next_states
+
+    def accepts(self, word):
+        symbol_ids = self.symbol_ids
+        states = self.start
+        for symbol in word:
+            symbol_id = symbol_ids.get(symbol)
+            if symbol_id is None or symbol == "":
+                return False
+            states = self.next_states(states, symbol_id)
+            if not states:
+                return False
+        return not self.final_ids.isdisjoint(states)
@@ -0,0 +1,86 @@
+import random
+import sys
+import time
+
+from finite_automata import FiniteAutomaton
+
+
+def random_nfa(state_count, alphabet, density, seed):
+    rng = random.Random(seed)
+    states = {f"q{i}" for i in range(state_count)}
+    transitions = []
+    for i in range(state_count):
+        for symbol in alphabet:
+            for j in range(state_count):
+                if rng.random() < density:
+                    transitions.append({"state": f"q{i}", "symbol": symbol, "to": f"q{j}"})
+    final_state = {f"q{i}" for i in range(state_count) if rng.random() < 0.3}
+    return FiniteAutomaton(states, set(alphabet), "q0", final_state, transitions)
+
+
+def random_dfa(state_count, alphabet, seed):
+    # Complete DFA with random targets, so some states are unreachable or equivalent
+    rng = random.Random(seed)
+    states = [f"q{i}" for i in range(state_count)]
+    transitions = [{"state": state, "symbol": symbol, "to": rng.choice(states)}
+                   for state in states for symbol in alphabet]
+    final_state = {state for state in states if rng.random() < 0.5}
+    return FiniteAutomaton(set(states), set(alphabet), "q0", final_state, transitions)
+
+
+def words_per_second(automaton, words):
+    start = time.perf_counter()
+    accepted = sum(automaton.accepts_many(words))
+    return len(words) / (time.perf_counter() - start), accepted
+
+
+def benchmark(state_counts, word_count=20000, word_length=40):
+    alphabet = ["a", "b"]
+    rng = random.Random(0)
+    words = ["".join(rng.choice(alphabet) for _ in range(word_length)) for _ in range(word_count)]
+
+    print(f"{'NFA':>5} {'DFA':>8} {'min DFA':>8} {'subset s':>9} {'min s':>7} "
+          f"{'lazy words/s':>13} {'DFA words/s':>12} {'min words/s':>12}")
+
+    for state_count in state_counts:
+        nfa = random_nfa(state_count, alphabet, density=2.0 / state_count, seed=state_count)
+
+        start = time.perf_counter()
+        dfa = nfa.convert_to_dfa()
+        subset_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        minimal = dfa.minimize()
+        minimize_time = time.perf_counter() - start
+
+        lazy_rate, accepted = words_per_second(nfa, words)
+        dfa_rate, dfa_accepted = words_per_second(dfa, words)
+        minimal_rate, minimal_accepted = words_per_second(minimal, words)
+        assert accepted == dfa_accepted == minimal_accepted
+
+        print(f"{state_count:>5} {len(dfa.states):>8} {len(minimal.states):>8} {subset_time:>9.3f} "
+              f"{minimize_time:>7.3f} {lazy_rate:>13.0f} {dfa_rate:>12.0f} {minimal_rate:>12.0f}")
+
+
+def benchmark_minimize(state_counts):
+    # Hopcroft on large DFAs; seconds per state should stay roughly flat
+    print(f"{'DFA':>8} {'min DFA':>8} {'min s':>8} {'us/state':>9}")
+
+    for state_count in state_counts:
+        dfa = random_dfa(state_count, ["a", "b"], seed=state_count)
+
+        start = time.perf_counter()
+        minimal = dfa.minimize()
+        elapsed = time.perf_counter() - start
+
+        print(f"{state_count:>8} {len(minimal.states):>8} {elapsed:>8.2f} {elapsed / state_count * 1e6:>9.1f}")
+
+
+if __name__ == '__main__':
+    # NFA sizes, e.g. `python benchmark_dfa.py 8 12 16`, or DFA sizes to
+    # minimize with `python benchmark_dfa.py --minimize 8192 32768 262144`
+    args = sys.argv[1:]
+    if args and args[0] == '--minimize':
+        benchmark_minimize([int(arg) for arg in args[1:]] or [8192, 32768, 262144])
+    else:
+        benchmark([int(arg) for arg in args] or [8, 12, 16, 20])
@@ -1,5 +1,9 @@
+from collections import deque
+
 from grammar import Grammar
 from graphviz import Digraph
+from automaton_runner import LazyDFARunner, TableRunner
+from transition_index import TransitionIndex, state_set_mask
 
 
 class FiniteAutomaton:
@@ -9,17 +13,45 @@ class FiniteAutomaton:
         self.initial_state = initial_state
         self.final_state = final_state
         self.transitions = transitions
+        self.index = TransitionIndex(states, alphabet, transitions)
+        self._runner = None
+
+    def add_transition(self, state, symbol, to):
+        self.transitions.append({"state": state, "symbol": symbol, "to": to})
+        self.index.add(state, symbol, to)
+        self._runner = None
+
+    def remove_transition(self, state, symbol, to):
+        self.transitions.remove({"state": state, "symbol": symbol, "to": to})
+        self.index.remove(state, symbol, to)
+        self._runner = None
+
+    def accepts(self, word):
+        return self._get_runner().accepts(word)
+
+    def accepts_many(self, words):
+        accepts = self._get_runner().accepts
+        for word in words:
+            yield accepts(word)
+
+    def _get_runner(self):
+        # Deterministic automata get a flat table; anything else is run as a
+        # lazy DFA over NFA state sets
+        if self._runner is None:
+            index = self.index
+            index.state_id(self.initial_state)
+
+            if self.is_deterministic() and not self._has_epsilon_transitions():
+                self._runner = TableRunner(index, self.initial_state, self.final_state)
+            else:
+                self._runner = LazyDFARunner(index, self.initial_state, self.final_state)
+        return self._runner
 
     def is_deterministic(self):
-        is_deterministic = True
-        seen = []
-        for transition in self.transitions:
-            key = [transition["state"], transition["symbol"]]
-            if key in seen:
-                is_deterministic = False
-                break
-            seen.append(key)
-        return is_deterministic
+        return self.index.is_deterministic()
+
+    def _has_epsilon_transitions(self):
+        return self.index.has_epsilon_transitions()
 
     def __get_productions(self):
         productions = {}
@@ -57,74 +89,207 @@ class FiniteAutomaton:
 
         dot.render(name, format='png', view=True)
 
-    def convert_to_dfa(self):
-        if self.is_deterministic():
-            return self
-
-        def epsilon_closure(states):
-            closure = set(states)
-            stack = list(states)
-
-            while stack:
-                state = stack.pop()
-                for transition in self.transitions:
-                    if transition["state"] == state and transition["symbol"] == "":
-                        if transition["to"] not in closure:
-                            closure.add(transition["to"])
-                            stack.append(transition["to"])
-            return closure
-
-        def move(states, symbol):
-            result = set()
-            for state in states:
-                for transition in self.transitions:
-                    if transition["state"] == state and transition["symbol"] == symbol:
-                        result.add(transition["to"])
-            return result
-
-        initial_dfa_state = frozenset(epsilon_closure({self.initial_state}))
-
-        dfa_states = [initial_dfa_state]
-        dfa_transitions = []
-        unprocessed_states = [initial_dfa_state]
+    def convert_to_dfa(self, minimize=False):
+        if self.is_deterministic() and not self._has_epsilon_transitions():
+            return self.minimize() if minimize else self
 
-        state_mapping = {initial_dfa_state: "q0"}
+        index = self.index
+        symbols = [symbol for symbol in self.alphabet if symbol != ""]
+        initial_id = index.state_id(self.initial_state)
+        # Closure and per-symbol step of every NFA state as sorted id tuples,
+        # so they take space in proportion to the transitions
+        closures = [index.epsilon_closure(state_id) for state_id in range(len(index.state_names))]
+        step = [self._steps(symbol, closures) for symbol in symbols]
+        final_ids = {index.state_ids[state] for state in self.final_state if state in index.state_ids}
 
-        while unprocessed_states:
-            current_state_set = unprocessed_states.pop(0)
+        # DFA states are NFA state sets interned in a dict by their int
+        # bitset, which is only built for the sets the construction reaches;
+        # ids follow discovery order, so names stay q0, q1, ...
+        initial_ids = closures[initial_id]
+        state_mapping = {state_set_mask(initial_ids): 0}
+        dfa_final_states = ["q0"] if not final_ids.isdisjoint(initial_ids) else []
+        dfa_transitions = []
+        unprocessed_states = deque([(0, initial_ids)])
 
-            for symbol in self.alphabet:
-                if symbol == "":
-                    continue
+        while unprocessed_states:
+            current_id, current_ids = unprocessed_states.popleft()
+            current_name = f"q{current_id}"
 
-                next_states = move(current_state_set, symbol)
-                next_state_closure = frozenset(epsilon_closure(next_states))
+            for symbol, symbol_step in zip(symbols, step):
+                next_ids = set()
+                for state_id in current_ids:
+                    next_ids.update(symbol_step[state_id])
 
-                if next_state_closure and next_state_closure not in dfa_states:
-                    dfa_states.append(next_state_closure)
-                    unprocessed_states.append(next_state_closure)
-                    state_mapping[next_state_closure] = f"q{len(state_mapping)}"
+                if not next_ids:
+                    continue
 
-                if next_state_closure:
-                    dfa_transitions.append({
-                        "state": state_mapping[current_state_set],
-                        "symbol": symbol,
-                        "to": state_mapping[next_state_closure]
-                    })
+                next_mask = state_set_mask(next_ids)
+                next_id = state_mapping.get(next_mask)
+                if next_id is None:
+                    next_id = len(state_mapping)
+                    state_mapping[next_mask] = next_id
+                    unprocessed_states.append((next_id, tuple(next_ids)))
+                    if not final_ids.isdisjoint(next_ids):
+                        dfa_final_states.append(f"q{next_id}")
 
-        dfa_final_states = []
-        for dfa_state_set in dfa_states:
-            if any(state in self.final_state for state in dfa_state_set):
-                dfa_final_states.append(state_mapping[dfa_state_set])
+                dfa_transitions.append({
+                    "state": current_name,
+                    "symbol": symbol,
+                    "to": f"q{next_id}"
+                })
 
-        dfa_state_names = list(state_mapping.values())
+        dfa_state_names = [f"q{dfa_id}" for dfa_id in state_mapping.values()]
 
         dfa = FiniteAutomaton(
             states=dfa_state_names,
-            alphabet=[symbol for symbol in self.alphabet if symbol != ""],
+            alphabet=symbols,
             initial_state="q0",
             final_state=dfa_final_states,
             transitions=dfa_transitions
         )
 
-        return dfa
+        return dfa.minimize() if minimize else dfa
+
+    def _steps(self, symbol, closures):
+        # steps[state]: sorted ids of everything reachable on symbol
+        index = self.index
+        symbol_id = index.symbol_ids.get(symbol)
+        steps = [()] * len(closures)
+        if symbol_id is None:
+            return steps
+
+        for state_id in range(len(closures)):
+            targets = index.get(state_id, symbol_id)
+            if targets:
+                reached = set()
+                for to in targets:
+                    reached.update(closures[to])
+                steps[state_id] = tuple(sorted(reached))
+        return steps
+
+    def minimize(self):
+        if not self.is_deterministic() or self._has_epsilon_transitions():
+            return self.convert_to_dfa(minimize=True)
+
+        index = self.index
+        symbols = [index.symbol_ids[symbol] for symbol in self.alphabet
+                   if symbol != "" and symbol in index.symbol_ids]
+        delta, reachable = self._complete_delta(symbols)
+        dead = len(delta) - 1
+        final_ids = {index.state_ids[state] for state in self.final_state if state in index.state_ids}
+        block_of = self._hopcroft_partition(delta, reachable, len(symbols), final_ids)
+
+        # Renumber blocks breadth-first from the initial state. States that
+        # share a block with the dead state cannot reach a final state, so
+        # the block and every transition into it are dropped.
+        dead_block = block_of[dead]
+        initial_block = block_of[index.state_ids[self.initial_state]]
+        representative = {}
+        for state in reachable:
+            representative.setdefault(block_of[state], state)
+
+        names = {initial_block: "q0"}
+        transitions = []
+        queue = deque([initial_block] if initial_block != dead_block else [])
+        while queue:
+            block = queue.popleft()
+            row = delta[representative[block]]
+            for column, symbol_id in enumerate(symbols):
+                target_block = block_of[row[column]]
+                if target_block == dead_block:
+                    continue
+                if target_block not in names:
+                    names[target_block] = f"q{len(names)}"
+                    queue.append(target_block)
+                transitions.append({
+                    "state": names[block],
+                    "symbol": index.symbol_names[symbol_id],
+                    "to": names[target_block]
+                })
+
+        final_states = [name for block, name in names.items()
+                        if block != dead_block and representative[block] in final_ids]
+
+        return FiniteAutomaton(
+            states=list(names.values()),
+            alphabet=[index.symbol_names[symbol_id] for symbol_id in symbols],
+            initial_state="q0",
+            final_state=final_states,
+            transitions=transitions
+        )
+
+    def _complete_delta(self, symbols):
+        # Dense transition rows over the states reachable from the initial
+        # state, completed with an explicit dead state as the last row
+        index = self.index
+        dead = len(index.state_names)
+        delta = [[dead] * len(symbols) for _ in range(dead + 1)]
+
+        start = index.state_ids[self.initial_state]
+        reachable = [start]
+        seen = {start}
+        for state in reachable:
+            for column, symbol_id in enumerate(symbols):
+                targets = index.get(state, symbol_id)
+                if targets:
+                    delta[state][column] = targets[0]
+                    if targets[0] not in seen:
+                        seen.add(targets[0])
+                        reachable.append(targets[0])
+        reachable.append(dead)
+        return delta, reachable
+
+    def _hopcroft_partition(self, delta, states, symbol_count, final_ids):
+        # Hopcroft's partition refinement: returns state -> block id, where
+        # states sharing a block are equivalent
+        final = [state for state in states[:-1] if state in final_ids]
+        non_final = [state for state in states if state not in final_ids]
+
+        inverse = [{} for _ in range(symbol_count)]
+        for state in states:
+            for column in range(symbol_count):
+                inverse[column].setdefault(delta[state][column], []).append(state)
+
+        blocks = [set(block) for block in (final, non_final) if block]
+        block_of = {}
+        for block_id, block in enumerate(blocks):
+            for state in block:
+                block_of[state] = block_id
+
+        smaller = 0 if len(blocks) == 1 or len(blocks[0]) <= len(blocks[1]) else 1
+        waiting = {(smaller, column) for column in range(symbol_count)}
+        worklist = deque(waiting)
+
+        while worklist:
+            splitter = worklist.popleft()
+            waiting.discard(splitter)
+            block_id, column = splitter
+
+            touched = {}
+            for target in list(blocks[block_id]):
+                for source in inverse[column].get(target, ()):
+                    touched.setdefault(block_of[source], set()).add(source)
+
+            for touched_id, inside in touched.items():
+                block = blocks[touched_id]
+                if len(inside) == len(block):
+                    continue
+
+                # Move the smaller half into a new block
+                if len(inside) > len(block) - len(inside):
+                    inside = block - inside
+                block -= inside
+                new_id = len(blocks)
+                blocks.append(inside)
+                for state in inside:
+                    block_of[state] = new_id
+
+                # Whether or not the old block was still waiting, queueing
+                # the new (smaller) half is enough
+                for symbol_column in range(symbol_count):
+                    pending = (new_id, symbol_column)
+                    if pending not in waiting:
+                        waiting.add(pending)
+                        worklist.append(pending)
+
+        return block_of
@@ -0,0 +1,87 @@
+class TransitionIndex:
+    # Transitions keyed by (state id, symbol id) with compact integer ids for
+    # states and symbols. Targets are kept as lists so a duplicated
+    # transition still counts as non-deterministic, like the original scan.
+    def __init__(self, states=(), alphabet=(), transitions=()):
+        self.state_ids = {}
+        self.state_names = []
+        self.symbol_ids = {}
+        self.symbol_names = []
+        self.targets = {}
+        self.ambiguous_keys = 0
+        # Transitions on the empty symbol "", counted like ambiguous_keys so
+        # checking for them never scans the table
+        self.epsilon_transitions = 0
+
+        for state in sorted(states, key=str):
+            self.state_id(state)
+        for symbol in sorted(alphabet, key=str):
+            self.symbol_id(symbol)
+        for transition in transitions:
+            self.add(transition["state"], transition["symbol"], transition["to"])
+
+    def state_id(self, state):
+        state_id = self.state_ids.get(state)
+        if state_id is None:
+            state_id = len(self.state_names)
+            self.state_ids[state] = state_id
+            self.state_names.append(state)
+        return state_id
+
+    def symbol_id(self, symbol):
+        symbol_id = self.symbol_ids.get(symbol)
+        if symbol_id is None:
+            symbol_id = len(self.symbol_names)
+            self.symbol_ids[symbol] = symbol_id
+            self.symbol_names.append(symbol)
+        return symbol_id
+
+    def add(self, state, symbol, to):
+        key = (self.state_id(state), self.symbol_id(symbol))
+        targets = self.targets.setdefault(key, [])
+        targets.append(self.state_id(to))
+        if len(targets) == 2:
+            self.ambiguous_keys += 1
+        if symbol == "":
+            self.epsilon_transitions += 1
+
+    def remove(self, state, symbol, to):
+        key = (self.state_ids[state], self.symbol_ids[symbol])
+        targets = self.targets[key]
+        targets.remove(self.state_ids[to])
+        if len(targets) == 1:
+            self.ambiguous_keys -= 1
+        elif not targets:
+            del self.targets[key]
+        if symbol == "":
+            self.epsilon_transitions -= 1
+
+    def get(self, state_id, symbol_id):
+        return self.targets.get((state_id, symbol_id), ())
+
+    def epsilon_closure(self, state_id):
+        # Sorted ids of the states reachable from state_id on "" moves
+        epsilon_id = self.symbol_ids.get("")
+        closure = {state_id}
+        if epsilon_id is not None and self.epsilon_transitions:
+            stack = [state_id]
+            while stack:
+                for to in self.get(stack.pop(), epsilon_id):
+                    if to not in closure:
+                        closure.add(to)
+                        stack.append(to)
+        return tuple(sorted(closure))
+
+    def is_deterministic(self):
+        return self.ambiguous_keys == 0
+
+    def has_epsilon_transitions(self):
+        return self.epsilon_transitions > 0
+
+
+def state_set_mask(state_ids):
+    # Int bitset of a set of state ids, as wide as its highest id
+    bits = bytearray((max(state_ids) >> 3) + 1)
+    for state_id in state_ids:
+        bits[state_id >> 3] |= 1 << (state_id & 7)
+    return int.from_bytes(bits, "little")
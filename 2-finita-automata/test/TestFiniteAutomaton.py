@@ -0,0 +1,159 @@
+import itertools
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from automaton_runner import LazyDFARunner, TableRunner
+from finite_automata import FiniteAutomaton
+
+
+def random_automaton(seed, epsilon=True):
+    rng = random.Random(seed)
+    states = [f"s{i}" for i in range(rng.randint(1, 7))]
+    alphabet = ["a", "b"] + ([""] if epsilon and rng.random() < 0.5 else [])
+    transitions = [{"state": rng.choice(states), "symbol": rng.choice(alphabet), "to": rng.choice(states)}
+                   for _ in range(rng.randint(0, 18))]
+    final_state = {state for state in states if rng.random() < 0.3}
+    return FiniteAutomaton(set(states), set(alphabet), "s0", final_state, transitions)
+
+
+def simulate(automaton, word):
+    # Reference NFA run straight over the transition list
+    def closure(states):
+        states = set(states)
+        stack = list(states)
+        while stack:
+            state = stack.pop()
+            for transition in automaton.transitions:
+                if transition["state"] == state and transition["symbol"] == "" and transition["to"] not in states:
+                    states.add(transition["to"])
+                    stack.append(transition["to"])
+        return states
+
+    current = closure([automaton.initial_state])
+    for symbol in word:
+        current = closure(transition["to"] for transition in automaton.transitions
+                          if transition["state"] in current and transition["symbol"] == symbol)
+    return any(state in automaton.final_state for state in current)
+
+
+def words(max_length, alphabet="ab"):
+    for length in range(max_length + 1):
+        for letters in itertools.product(alphabet, repeat=length):
+            yield "".join(letters)
+
+
+def minimal_state_count(dfa):
+    # Moore's refinement over the reachable states that can still reach a
+    # final state; the count of resulting classes is the minimal size, and
+    # an empty language still keeps its initial state
+    moves = {(t["state"], t["symbol"]): t["to"] for t in dfa.transitions}
+    symbols = sorted(symbol for symbol in dfa.alphabet if symbol)
+    reachable = {dfa.initial_state}
+    stack = [dfa.initial_state]
+    while stack:
+        state = stack.pop()
+        for symbol in symbols:
+            to = moves.get((state, symbol))
+            if to is not None and to not in reachable:
+                reachable.add(to)
+                stack.append(to)
+
+    live = {state for state in reachable if state in dfa.final_state}
+    changed = True
+    while changed:
+        changed = False
+        for state in reachable - live:
+            if any(moves.get((state, symbol)) in live for symbol in symbols):
+                live.add(state)
+                changed = True
+    if not live:
+        return 1
+
+    block = {state: state in dfa.final_state for state in live}
+    while True:
+        signature = {state: (block[state],) + tuple(block.get(moves.get((state, symbol))) for symbol in symbols)
+                     for state in live}
+        if len(set(signature.values())) == len(set(block.values())):
+            return len(set(block.values()))
+        block = signature
+
+
+class TestFiniteAutomaton(unittest.TestCase):
+    def test_convert_to_dfa_matches_nfa(self):
+        for seed in range(200):
+            nfa = random_automaton(seed)
+            dfa = nfa.convert_to_dfa()
+            self.assertTrue(dfa.is_deterministic())
+            for word in words(6):
+                self.assertEqual(simulate(dfa, word), simulate(nfa, word), (seed, word))
+
+    def test_minimize_keeps_language_with_minimal_states(self):
+        for seed in range(200):
+            nfa = random_automaton(seed)
+            dfa = nfa.convert_to_dfa()
+            minimal = dfa.minimize()
+            self.assertEqual(len(minimal.states), minimal_state_count(dfa), seed)
+            self.assertEqual(len(nfa.convert_to_dfa(minimize=True).states), len(minimal.states))
+            for word in words(6):
+                self.assertEqual(simulate(minimal, word), simulate(nfa, word), (seed, word))
+
+    def test_minimize_third_symbol_from_the_end(self):
+        # (a|b)* a (a|b)(a|b): the minimal DFA has 2^3 states
+        states = {"p0", "p1", "p2", "p3"}
+        transitions = [{"state": "p0", "symbol": symbol, "to": "p0"} for symbol in "ab"]
+        transitions.append({"state": "p0", "symbol": "a", "to": "p1"})
+        for state, to in (("p1", "p2"), ("p2", "p3")):
+            transitions += [{"state": state, "symbol": symbol, "to": to} for symbol in "ab"]
+        nfa = FiniteAutomaton(states, {"a", "b"}, "p0", {"p3"}, transitions)
+
+        minimal = nfa.convert_to_dfa(minimize=True)
+        self.assertEqual(len(minimal.states), 8)
+        for word in words(7):
+            self.assertEqual(minimal.accepts(word), len(word) >= 3 and word[-3] == "a", word)
+
+    def test_accepts_matches_simulation(self):
+        for seed in range(200):
+            nfa = random_automaton(seed)
+            dfa = nfa.convert_to_dfa()
+            samples = list(words(5, "abc"))
+            expected = [simulate(nfa, word) for word in samples]
+            self.assertEqual(list(nfa.accepts_many(samples)), expected, seed)
+            self.assertEqual(list(dfa.accepts_many(samples)), expected, seed)
+            self.assertEqual([dfa.accepts(word) for word in samples], expected, seed)
+
+    def test_runner_choice(self):
+        nfa = random_automaton(3)
+        nfa.add_transition("s0", "a", "s0")
+        nfa.add_transition("s0", "a", "s0")
+        nfa.accepts("")
+        self.assertIsInstance(nfa._runner, LazyDFARunner)
+
+        dfa = nfa.convert_to_dfa()
+        dfa.accepts("")
+        self.assertIsInstance(dfa._runner, TableRunner)
+
+    def test_index_tracks_edits(self):
+        rng = random.Random(0)
+        automaton = FiniteAutomaton({"s0", "s1", "s2"}, {"a", "b", ""}, "s0", {"s2"}, [])
+        for _ in range(500):
+            if automaton.transitions and rng.random() < 0.4:
+                transition = rng.choice(automaton.transitions)
+                automaton.remove_transition(transition["state"], transition["symbol"], transition["to"])
+            else:
+                automaton.add_transition(rng.choice(["s0", "s1", "s2"]), rng.choice(["a", "b", ""]),
+                                         rng.choice(["s0", "s1", "s2"]))
+
+            keys = [(t["state"], t["symbol"]) for t in automaton.transitions]
+            self.assertEqual(automaton.is_deterministic(), len(keys) == len(set(keys)))
+            self.assertEqual(automaton._has_epsilon_transitions(),
+                             any(t["symbol"] == "" for t in automaton.transitions))
+            word = "".join(rng.choice("ab") for _ in range(rng.randint(0, 4)))
+            self.assertEqual(automaton.accepts(word), simulate(automaton, word))
+
+
+if __name__ == '__main__':
+    unittest.main()
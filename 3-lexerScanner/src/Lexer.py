@@ -1,7 +1,17 @@
+import codecs
+import mmap
 import re
 from Token import Token
 
 class Lexer:
+    # Bytes/characters pulled from the source per read when streaming
+    CHUNK_SIZE = 64 * 1024
+    # A match is only trusted when at least this many characters follow it in
+    # the buffer, so a token cut by a chunk boundary is never split in two
+    LOOKAHEAD = 32
+    # Longest token (or unclosed string) buffered before giving up
+    MAX_TOKEN_LENGTH = 1 << 20
+
     def __init__(self):
         self.tokens = []
         self.token_patterns = {
@@ -20,41 +30,104 @@ class Lexer:
             'WHITESPACE': r'[ \t]+',
             'NEWLINE': r'\n'
         }
+        # Alternation keeps dict order, so the first pattern that matches wins
+        self.regex = re.compile('|'.join(
+            f'(?P<{token_type}>{pattern})' for token_type, pattern in self.token_patterns.items()
+        ))
 
     def tokenize(self, text):
-        self.tokens = []
+        self.tokens = list(self.iter_tokens(text))
+        return self.tokens
+
+    def iter_tokens(self, source, encoding='utf-8'):
+        # Accepts a str, a file object, an mmap or an iterator of str/bytes
+        # chunks. Only the unconsumed tail of the current chunk is buffered,
+        # so memory is bounded by the chunk size and the longest token.
+        chunks = self._iter_chunks(source, encoding)
+        exhausted = False
+        buffer = ''
         position = 0
+        offset = 0  # absolute position of buffer[0] in the source
         line = 1
         column = 1
-        length = len(text)
-        
-        while position < length:
-            match_found = False
-            
-            for token_type, pattern in self.token_patterns.items():
-                regex = re.compile(f'^{pattern}')
-                segment = text[position:]
-                match = regex.match(segment)
-                
-                if match:
-                    value = match.group(0)
-                    
-                    if token_type == 'NEWLINE':
-                        line += 1
-                        column = 1
-                    elif token_type == 'WHITESPACE':
-                        column += len(value)
-                    else:
-                        self.tokens.append(Token(token_type, value, line, column))
-                        column += len(value)
-                    
-                    position += len(value)
-                    match_found = True
-                    break
-                    
-            if not match_found:
-                snippet = text[position:min(position + 20, length)]
-                raise ValueError(f"Unrecognized token at position {position}, line {line}, column {column}: '{snippet}'")
-                
-        self.tokens.append(Token('EOF', '', line, column))
-        return self.tokens
+        match = self.regex.match
+
+        while True:
+            length = len(buffer)
+
+            if position >= length and exhausted:
+                break
+
+            m = match(buffer, position) if position < length else None
+
+            if not exhausted and self._needs_more(m, buffer, position, length):
+                pending = length - position
+                if pending > self.MAX_TOKEN_LENGTH:
+                    what = "Unclosed string" if buffer[position] == '"' else "Token"
+                    raise ValueError(f"{what} longer than {self.MAX_TOKEN_LENGTH} characters "
+                                     f"at position {offset + position}, line {line}, column {column}")
+
+                # Read at least as much again as is already pending before
+                # matching again, so a token spanning many chunks is joined
+                # and rescanned a logarithmic number of times
+                parts = [buffer[position:]]
+                received = 0
+                while received < max(pending, self.LOOKAHEAD):
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        exhausted = True
+                        break
+                    parts.append(chunk)
+                    received += len(chunk)
+                offset += position
+                buffer = ''.join(parts)
+                position = 0
+                continue
+
+            if m is None:
+                snippet = buffer[position:position + 20]
+                raise ValueError(f"Unrecognized token at position {offset + position}, line {line}, column {column}: '{snippet}'")
+
+            token_type = m.lastgroup
+            value = m.group()
+
+            if token_type == 'NEWLINE':
+                line += 1
+                column = 1
+            elif token_type == 'WHITESPACE':
+                column += len(value)
+            else:
+                yield Token(token_type, value, line, column)
+                column += len(value)
+
+            position = m.end()
+
+        yield Token('EOF', '', line, column)
+
+    def _needs_more(self, m, buffer, position, length):
+        if m is not None:
+            return m.end() + self.LOOKAHEAD > length
+        # Nothing matched: either the buffer is nearly empty or a string
+        # literal has not been closed yet within the buffered text
+        return length - position < self.LOOKAHEAD or buffer[position] == '"'
+
+    def _iter_chunks(self, source, encoding):
+        if isinstance(source, (str, bytes)):
+            raw_chunks = iter([source])
+        elif isinstance(source, mmap.mmap):
+            raw_chunks = (source[i:i + self.CHUNK_SIZE] for i in range(0, len(source), self.CHUNK_SIZE))
+        elif hasattr(source, 'read'):
+            raw_chunks = iter(lambda: source.read(self.CHUNK_SIZE), source.read(0))
+        else:
+            raw_chunks = iter(source)
+
+        decoder = codecs.getincrementaldecoder(encoding)()
+        for chunk in raw_chunks:
+            if isinstance(chunk, (bytes, bytearray, memoryview)):
+                chunk = decoder.decode(chunk)
+            if chunk:
+                yield chunk
+
+        tail = decoder.decode(b'', final=True)
+        if tail:
+            yield tail
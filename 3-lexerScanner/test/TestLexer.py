@@ -0,0 +1,63 @@
+import io
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from Lexer import Lexer
+
+
+class TestLexer(unittest.TestCase):
+    def setUp(self):
+        self.lexer = Lexer()
+        self.source = (
+            'PROCESS {\n'
+            '    TITLE: "Mass Production";\n'
+            '    TIME: 30 days;\n'
+            '    COMPONENT: 1000.5 "chassis frames";\n'
+            '    TEMP: 180 C;\n'
+            '}\n'
+        )
+
+    def test_tokenize_tracks_line_and_column(self):
+        tokens = self.lexer.tokenize(self.source)
+        self.assertEqual(tokens[0], ('KEYWORD', 'PROCESS', 1, 1))
+        self.assertEqual(tokens[2], ('KEYWORD', 'TITLE', 2, 5))
+        self.assertEqual(tokens[-1].token_type, 'EOF')
+
+    def test_iter_tokens_matches_tokenize_across_chunk_boundaries(self):
+        expected = self.lexer.tokenize(self.source)
+        for size in (1, 2, 5, 13):
+            chunks = [self.source[i:i + size] for i in range(0, len(self.source), size)]
+            self.assertEqual(list(self.lexer.iter_tokens(iter(chunks))), expected)
+
+    def test_iter_tokens_reads_file_objects(self):
+        expected = self.lexer.tokenize(self.source)
+        self.lexer.CHUNK_SIZE = 7
+        self.assertEqual(list(self.lexer.iter_tokens(io.StringIO(self.source))), expected)
+        self.assertEqual(list(self.lexer.iter_tokens(io.BytesIO(self.source.encode()))), expected)
+
+    def test_unrecognized_token(self):
+        with self.assertRaises(ValueError):
+            list(self.lexer.iter_tokens(iter(['PROCESS ', '@'])))
+
+    def test_long_tokens_span_many_chunks(self):
+        name = 'x' * 5000
+        text = '"' + 'a' * 5000 + '" ' + name + ';'
+        chunks = [text[i:i + 3] for i in range(0, len(text), 3)]
+        tokens = list(self.lexer.iter_tokens(iter(chunks)))
+        self.assertEqual(tokens, self.lexer.tokenize(text))
+        self.assertEqual(tokens[1], ('ID', name, 1, 5004))
+
+    def test_unclosed_string_is_capped(self):
+        self.lexer.MAX_TOKEN_LENGTH = 100
+        chunks = iter(['TITLE: "never closed'] + ['a' * 10] * 1000)
+        with self.assertRaises(ValueError):
+            list(self.lexer.iter_tokens(chunks))
+        # The error comes long before the whole input is read
+        self.assertGreater(len(list(chunks)), 900)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,5 @@
+from itertools import islice
+
 from regex_parser import RegexParser
 from regex_generator import RegexGenerator
 
@@ -10,16 +12,22 @@ patterns = [
 parser = RegexParser()
 generator = RegexGenerator()
 
+# Combinations are written in batches of this size instead of one by one
+BATCH_SIZE = 10000
+
 file_path = "/home/mrdine/University/2nd/semester2/DSL_Laboratory_works/4- Regular Expressions/src/file/regex_combination.txt"
-with open(file_path, "a") as f:
+with open(file_path, "a", buffering=1024 * 1024) as f:
     for pattern in patterns:
         tokens = parser.parse(pattern)
-        results = generator.generate(tokens)
+        results = generator.generate_iter(tokens)
 
-        # Write the pattern and the combinations
+        # Write the pattern and stream the combinations to disk
         f.write(f"Pattern: {pattern}\n")
-        for combo in results:
-            f.write(combo + "\n")
+        while True:
+            batch = list(islice(results, BATCH_SIZE))
+            if not batch:
+                break
+            f.write("\n".join(batch) + "\n")
 
         # Show log steps
         print("\nLog steps:")
@@ -27,7 +35,7 @@ with open(file_path, "a") as f:
         generator.logger.show_steps()
 
         print("\nSample combinations:")
-        for sample in results[:5]:
+        for sample in islice(generator.generate_iter(tokens), 5):
             print(sample)
 
         print(f"All combinations saved to {file_path}")
\ No newline at end of file
@@ -0,0 +1,134 @@
+from collections import namedtuple
+from functools import lru_cache
+import itertools
+
+# AST nodes. Every node carries the (start, end) span it covers in the
+# pattern. Nodes are immutable, so parsed trees can be shared by the cache.
+Char = namedtuple('Char', ['value', 'span'])
+Concat = namedtuple('Concat', ['items', 'span'])
+Alt = namedtuple('Alt', ['options', 'span'])
+Group = namedtuple('Group', ['body', 'span'])
+# Either modifier ('?', '*', '+') or count (from ^{n}) is set
+Repeat = namedtuple('Repeat', ['node', 'modifier', 'count', 'span'])
+
+# Upper bound used for '*' and '+', the same limit the generator uses
+MAX_REPEAT = 5
+
+
+class _Parser:
+    # Single left-to-right pass over the pattern:
+    #   alt    := concat ('|' concat)*
+    #   concat := repeat*
+    #   repeat := atom ('?' | '*' | '+' | '^{' digits '}')?
+    #   atom   := '(' alt ')' | any other character
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self.pos = 0
+
+    def parse(self):
+        node = self.parse_alt()
+        if self.pos < len(self.pattern):
+            raise ValueError(f"Unmatched ')' at position {self.pos} in pattern: {self.pattern}")
+        return node
+
+    def parse_alt(self):
+        start = self.pos
+        options = [self.parse_concat()]
+        while self.peek() == '|':
+            self.pos += 1
+            options.append(self.parse_concat())
+        if len(options) == 1:
+            return options[0]
+        return Alt(tuple(options), (start, self.pos))
+
+    def parse_concat(self):
+        start = self.pos
+        items = []
+        while self.pos < len(self.pattern) and self.peek() not in '|)':
+            items.append(self.parse_repeat())
+        return Concat(tuple(items), (start, self.pos))
+
+    def parse_repeat(self):
+        start = self.pos
+        atom = self.parse_atom()
+        char = self.peek()
+
+        if char is not None and char in '?*+':
+            self.pos += 1
+            return Repeat(atom, char, None, (start, self.pos))
+
+        if char == '^':
+            count = self.parse_count()
+            if count is not None:
+                return Repeat(atom, None, count, (start, self.pos))
+
+        return atom
+
+    def parse_count(self):
+        # '^{digits}'; anything else leaves '^' to be read as a literal
+        pattern = self.pattern
+        i = self.pos + 1
+        if i >= len(pattern) or pattern[i] != '{':
+            return None
+        j = i + 1
+        while j < len(pattern) and pattern[j].isdigit():
+            j += 1
+        if j == i + 1 or j >= len(pattern) or pattern[j] != '}':
+            return None
+        self.pos = j + 1
+        return int(pattern[i + 1:j])
+
+    def parse_atom(self):
+        start = self.pos
+        char = self.pattern[self.pos]
+        self.pos += 1
+
+        if char != '(':
+            return Char(char, (start, self.pos))
+
+        body = self.parse_alt()
+        if self.peek() != ')':
+            raise ValueError(f"Unclosed group at position {start} in pattern: {self.pattern}")
+        self.pos += 1
+        return Group(body, (start, self.pos))
+
+    def peek(self):
+        if self.pos < len(self.pattern):
+            return self.pattern[self.pos]
+        return None
+
+
+@lru_cache(maxsize=1024)
+def parse_regex(pattern):
+    return _Parser(pattern).parse()
+
+
+def expand(node):
+    # All strings a node stands for, using the generator's repetition limits
+    if isinstance(node, Char):
+        yield node.value
+    elif isinstance(node, Concat):
+        for combo in itertools.product(*(list(expand(item)) for item in node.items)):
+            yield ''.join(combo)
+    elif isinstance(node, Alt):
+        for option in node.options:
+            yield from expand(option)
+    elif isinstance(node, Group):
+        yield from expand(node.body)
+    elif isinstance(node, Repeat):
+        options = list(expand(node.node))
+        if node.count is not None:
+            low = high = node.count
+        else:
+            low = 1 if node.modifier == '+' else 0
+            high = 1 if node.modifier == '?' else MAX_REPEAT
+        for i in range(low, high + 1):
+            for combo in itertools.product(options, repeat=i):
+                yield ''.join(combo)
+
+
+def group_options(node):
+    # Option strings of a group body: one entry per alternative when the
+    # alternatives are plain text, expanded strings for nested constructs
+    alternatives = node.options if isinstance(node, Alt) else (node,)
+    return [string for alternative in alternatives for string in expand(alternative)]
@@ -1,17 +1,222 @@
 import itertools
+import os
+import random
+import shutil
+from concurrent.futures import ProcessPoolExecutor
 from regex_logger import RegexLogger
 
 
+class RepeatPart:
+    # Every concatenation of low..high picks from options, in the order
+    # itertools.product would give them. Behaves like a read-only sequence
+    # (len, indexing, iteration) without ever expanding the strings.
+    def __init__(self, options, low, high):
+        self.options = list(options)
+        self.low = low
+        self.high = high
+        self.sizes = [len(self.options) ** i for i in range(low, high + 1)]
+        self.size = sum(self.sizes)
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        for i in range(self.low, self.high + 1):
+            for combo in itertools.product(self.options, repeat=i):
+                yield ''.join(combo)
+
+    def __getitem__(self, k):
+        if not 0 <= k < self.size:
+            raise IndexError(k)
+        repetition = self.low
+        for size in self.sizes:
+            if k < size:
+                break
+            k -= size
+            repetition += 1
+
+        picks = []
+        for _ in range(repetition):
+            k, digit = divmod(k, len(self.options))
+            picks.append(self.options[digit])
+        return ''.join(reversed(picks))
+
+
+def lazy_product(parts):
+    # Same order as itertools.product, but the parts are walked with an
+    # odometer of iterators instead of being copied into tuples first
+    iterators = [iter(part) for part in parts]
+    current = []
+    for iterator in iterators:
+        value = next(iterator, None)
+        if value is None:
+            return
+        current.append(value)
+
+    while True:
+        yield ''.join(current)
+
+        position = len(parts) - 1
+        while position >= 0:
+            value = next(iterators[position], None)
+            if value is not None:
+                current[position] = value
+                break
+            iterators[position] = iter(parts[position])
+            current[position] = next(iterators[position])
+            position -= 1
+
+        if position < 0:
+            return
+
+
+def combination_at(parts, k):
+    # Mixed-radix decoding of k: the last part varies fastest, exactly like
+    # the order of lazy_product
+    pieces = []
+    for part in reversed(parts):
+        k, digit = divmod(k, len(part))
+        pieces.append(part[digit])
+    return ''.join(reversed(pieces))
+
+
+def iter_combination_range(parts, start, stop):
+    # Combinations start..stop-1 in generate_iter order, advancing a
+    # mixed-radix counter of per-part digits
+    if start >= stop:
+        return
+    radices = [len(part) for part in parts]
+    digits = []
+    k = start
+    for radix in reversed(radices):
+        k, digit = divmod(k, radix)
+        digits.append(digit)
+    digits.reverse()
+    current = [part[digit] for part, digit in zip(parts, digits)]
+
+    for _ in range(stop - start):
+        yield ''.join(current)
+
+        position = len(parts) - 1
+        while position >= 0:
+            digits[position] += 1
+            if digits[position] < radices[position]:
+                current[position] = parts[position][digits[position]]
+                break
+            digits[position] = 0
+            current[position] = parts[position][0]
+            position -= 1
+
+
+def write_shard(tokens, start, stop, path, batch_size=10000):
+    # Runs in a worker process: rebuild the parts from the tokens and write
+    # combinations start..stop-1, one per line
+    parts = RegexGenerator(RegexLogger(level=RegexLogger.OFF)).build_parts(tokens)
+    combinations = iter_combination_range(parts, start, stop)
+    with open(path, "w", buffering=1024 * 1024) as f:
+        while True:
+            batch = list(itertools.islice(combinations, batch_size))
+            if not batch:
+                break
+            f.write("\n".join(batch) + "\n")
+    return path
+
+
+def combination_count(parts):
+    total = 1
+    for part in parts:
+        total *= len(part)
+    return total
+
+
 class RegexGenerator:
-    def __init__(self):
-        self.logger = RegexLogger()
+    def __init__(self, logger=None):
+        self.logger = logger if logger is not None else RegexLogger()
 
     def generate(self, tokens):
-        self.logger = RegexLogger()
+        all_combinations = list(self.generate_iter(tokens))
+        self.logger.process("Generated %d total combinations", len(all_combinations))
+        return all_combinations
+
+    def generate_iter(self, tokens):
+        self.logger.clear()
+        result_parts = self.build_parts(tokens)
+
+        # Generate all combinations
+        self.logger.process("Generating final combinations...")
+        return lazy_product(result_parts)
+
+    def count(self, tokens):
+        self.logger.clear()
+        return combination_count(self.build_parts(tokens))
+
+    def nth(self, tokens, k):
+        self.logger.clear()
+        parts = self.build_parts(tokens)
+        total = combination_count(parts)
+        if not 0 <= k < total:
+            raise IndexError(f"Combination index {k} out of range for {total} combinations")
+        return combination_at(parts, k)
+
+    def sample(self, tokens, n, seed=None):
+        # n distinct combinations drawn uniformly, returned in index order
+        self.logger.clear()
+        parts = self.build_parts(tokens)
+        total = combination_count(parts)
+        if n > total:
+            raise ValueError(f"Sample of {n} is larger than the {total} available combinations")
+
+        rng = random.Random(seed)
+        if 2 * n > total:
+            indices = rng.sample(range(total), n)
+        else:
+            indices = set()
+            while len(indices) < n:
+                indices.add(rng.randrange(total))
+
+        return [combination_at(parts, k) for k in sorted(indices)]
+
+    def generate_parallel(self, tokens, workers=None, out_dir="shards", shards=None, merge=False):
+        # Splits the index space into contiguous shards, one output file
+        # each. Shard i holds a contiguous slice of the generate_iter order,
+        # so reading the files by name gives the exact sequential output.
+        self.logger.clear()
+        total = combination_count(self.build_parts(tokens))
+        workers = workers or os.cpu_count() or 1
+        shards = max(1, min(shards or workers, total))
+        os.makedirs(out_dir, exist_ok=True)
+
+        bounds = [total * i // shards for i in range(shards + 1)]
+        paths = [os.path.join(out_dir, f"shard_{i:05d}.txt") for i in range(shards)]
+        self.logger.process("Writing %d combinations in %d shards with %d workers", total, shards, workers)
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(write_shard, tokens, bounds[i], bounds[i + 1], paths[i])
+                       for i in range(shards)]
+            paths = [future.result() for future in futures]
+
+        if not merge:
+            return paths
+
+        merged_path = os.path.join(out_dir, "combinations.txt")
+        with open(merged_path, "wb") as merged:
+            for path in paths:
+                with open(path, "rb") as shard:
+                    shutil.copyfileobj(shard, merged, 1024 * 1024)
+                os.remove(path)
+        self.logger.process("Merged shards into %s", merged_path)
+        return [merged_path]
+
+    def build_parts(self, tokens):
+        with self.logger.timed("build parts"):
+            return self._build_parts(tokens)
+
+    def _build_parts(self, tokens):
         result_parts = []
+        debug = self.logger.debug
 
         for token_type, token_value in tokens:
-            self.logger.process(f"Processing token: {token_type} - {token_value}")
+            debug("Processing token: %s - %s", token_type, token_value)
 
             if token_type == 'char':
                 # Simple character
@@ -21,7 +226,7 @@ class RegexGenerator:
                 # Character with repetition
                 char, repetition = token_value
                 result_parts.append([char * repetition])
-                self.logger.process(f"Generated repeated character: {char * repetition}")
+                debug("Generated repeated character: %s", result_parts[-1][0])
 
             elif token_type == 'char_mod':
                 # Character with modifier
@@ -29,15 +234,15 @@ class RegexGenerator:
                 if modifier == '?':
                     # Optional (0 or 1)
                     result_parts.append(['', char])
-                    self.logger.process(f"Generated optional character: '' or '{char}'")
+                    debug("Generated optional character: '' or '%s'", char)
                 elif modifier == '*':
                     # Zero or more (limit to 5)
-                    result_parts.append([char * i for i in range(6)])
-                    self.logger.process(f"Generated 0-5 repetitions of '{char}'")
+                    result_parts.append(RepeatPart([char], 0, 5))
+                    debug("Generated 0-5 repetitions of '%s'", char)
                 elif modifier == '+':
                     # One or more (limit to 5)
-                    result_parts.append([char * i for i in range(1, 6)])
-                    self.logger.process(f"Generated 1-5 repetitions of '{char}'")
+                    result_parts.append(RepeatPart([char], 1, 5))
+                    debug("Generated 1-5 repetitions of '%s'", char)
 
             elif token_type == 'group':
                 # Group with repetition
@@ -45,15 +250,14 @@ class RegexGenerator:
                 if repetition == 1:
                     # Group without repetition
                     result_parts.append(options)
-                    self.logger.process(f"Generated group options: {options}")
+                    debug("Generated group options: %s", options)
                 else:
                     # Group with repetition
-                    combinations = []
-                    for combo in itertools.product(options, repeat=repetition):
-                        combinations.append(''.join(combo))
+                    combinations = RepeatPart(options, repetition, repetition)
                     result_parts.append(combinations)
-                    self.logger.process(
-                        f"Generated group repetitions: {combinations[:5]}{'...' if len(combinations) > 5 else ''}")
+                    debug(lambda combinations=combinations: "Generated group repetitions: %s%s" % (
+                        [combinations[i] for i in range(min(5, len(combinations)))],
+                        '...' if len(combinations) > 5 else ''))
 
             elif token_type == 'group_mod':
                 # Group with modifier
@@ -61,31 +265,14 @@ class RegexGenerator:
                 if modifier == '?':
                     # Optional group (0 or 1)
                     result_parts.append([''] + options)
-                    self.logger.process(f"Generated optional group: '' or {options}")
+                    debug("Generated optional group: '' or %s", options)
                 elif modifier == '*':
                     # Zero or more (limit to 5)
-                    combinations = ['']
-                    for i in range(1, 6):
-                        for combo in itertools.product(options, repeat=i):
-                            combinations.append(''.join(combo))
-                    result_parts.append(combinations)
-                    self.logger.process(f"Generated 0-5 group repetitions")
+                    result_parts.append(RepeatPart(options, 0, 5))
+                    debug("Generated 0-5 group repetitions")
                 elif modifier == '+':
                     # One or more (limit to 5)
-                    combinations = []
-                    for i in range(1, 6):
-                        for combo in itertools.product(options, repeat=i):
-                            combinations.append(''.join(combo))
-                    result_parts.append(combinations)
-                    self.logger.process(f"Generated 1-5 group repetitions")
-
-        # Generate all combinations
-        self.logger.process("Generating final combinations...")
-        all_combinations = []
-
-        # Combine all parts
-        for combo in itertools.product(*result_parts):
-            all_combinations.append(''.join(combo))
+                    result_parts.append(RepeatPart(options, 1, 5))
+                    debug("Generated 1-5 group repetitions")
 
-        self.logger.process(f"Generated {len(all_combinations)} total combinations")
-        return all_combinations
\ No newline at end of file
+        return result_parts
@@ -1,10 +1,75 @@
+import json
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
 class RegexLogger:
-    def __init__(self):
-        self.steps = []
+    DEBUG = 10
+    INFO = 20
+    OFF = 100
+
+    def __init__(self, level=DEBUG, max_steps=10000, sink=None):
+        # Steps are stored unformatted as (message, args) in a ring buffer of
+        # max_steps entries and only rendered by show_steps/formatted_steps.
+        # sink, when given, is a file-like object that receives one JSON
+        # line per step with its timestamp and the time since the last step.
+        self.level = level
+        self.steps = deque(maxlen=max_steps)
+        self.sink = sink
+        self.last_time = time.perf_counter()
+
+    def enabled_for(self, level):
+        return level >= self.level
+
+    def process(self, step, *args, level=INFO):
+        # Disabled fast path: nothing is formatted or stored
+        if level < self.level:
+            return
+        self.steps.append((step, args))
+        if self.sink is not None:
+            self._write(step, args)
+
+    def debug(self, step, *args):
+        self.process(step, *args, level=self.DEBUG)
+
+    @contextmanager
+    def timed(self, stage):
+        # Times a block of work and writes it to the sink as one record;
+        # without a sink this is a no-op
+        if self.sink is None or self.level >= self.OFF:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._write("Finished %s in %.6f s", (stage, elapsed), stage=stage, elapsed=elapsed)
+
+    def clear(self):
+        self.steps.clear()
+        self.last_time = time.perf_counter()
+
+    def _write(self, step, args, **fields):
+        now = time.perf_counter()
+        record = {"time": now, "delta": now - self.last_time, "step": self.format_step(step, args)}
+        record.update(fields)
+        self.sink.write(json.dumps(record) + "\n")
+        self.last_time = now
+
+    @staticmethod
+    def format_step(step, args):
+        # Messages are either callables, %-style templates or plain text
+        if callable(step):
+            return step()
+        if args:
+            return step % args
+        return step
 
-    def process(self, step):
-        self.steps.append(step)
+    def formatted_steps(self):
+        return [self.format_step(step, args) for step, args in self.steps]
 
     def show_steps(self):
-        for i, step in enumerate(self.steps, 1):
-            print(f"Step {i}: {step}")
\ No newline at end of file
+        for i, step in enumerate(self.formatted_steps(), 1):
+            print(f"Step {i}: {step}")
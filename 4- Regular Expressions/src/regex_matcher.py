@@ -0,0 +1,146 @@
+from regex_parser import RegexParser
+
+
+class ThompsonNFA:
+    # Thompson construction over the RegexParser token stream. States are
+    # integers; char_edges[s] lists (char, target) and epsilon[s] lists the
+    # targets of empty moves.
+    def __init__(self):
+        self.char_edges = []
+        self.epsilon = []
+
+    def new_state(self):
+        self.char_edges.append([])
+        self.epsilon.append([])
+        return len(self.epsilon) - 1
+
+    def literal(self, text):
+        start = end = self.new_state()
+        for char in text:
+            target = self.new_state()
+            self.char_edges[end].append((char, target))
+            end = target
+        return start, end
+
+    def options(self, options):
+        start, end = self.new_state(), self.new_state()
+        for option in options:
+            option_start, option_end = self.literal(option)
+            self.epsilon[start].append(option_start)
+            self.epsilon[option_end].append(end)
+        return start, end
+
+    def concat(self, fragments):
+        start = end = self.new_state()
+        for fragment_start, fragment_end in fragments:
+            self.epsilon[end].append(fragment_start)
+            end = fragment_end
+        return start, end
+
+    def modified(self, build, modifier):
+        # '?' zero or one, '*' zero or more, '+' one or more (unbounded)
+        inner_start, inner_end = build()
+        start, end = self.new_state(), self.new_state()
+        self.epsilon[start].append(inner_start)
+        self.epsilon[inner_end].append(end)
+        if modifier in '?*':
+            self.epsilon[start].append(end)
+        if modifier in '*+':
+            self.epsilon[inner_end].append(inner_start)
+        return start, end
+
+    def from_tokens(self, tokens):
+        fragments = []
+        for token_type, token_value in tokens:
+            if token_type == 'char':
+                fragments.append(self.literal(token_value))
+            elif token_type == 'char_rep':
+                char, repetition = token_value
+                fragments.append(self.literal(char * repetition))
+            elif token_type == 'char_mod':
+                char, modifier = token_value
+                fragments.append(self.modified(lambda char=char: self.literal(char), modifier))
+            elif token_type == 'group':
+                options, repetition = token_value
+                fragments.append(self.concat([self.options(options) for _ in range(repetition)]))
+            elif token_type == 'group_mod':
+                options, modifier = token_value
+                fragments.append(self.modified(lambda options=options: self.options(options), modifier))
+            else:
+                raise ValueError(f"Unknown token type: {token_type}")
+        return self.concat(fragments)
+
+
+class CompiledRegex:
+    # Full-string matcher. Simulates the NFA over sets of states stored as
+    # int bitsets, so a match costs O(len(text) * states) with no
+    # backtracking. With use_dfa the discovered set-to-set transitions are
+    # cached (a lazy DFA), up to cache_size entries.
+    def __init__(self, tokens, use_dfa=True, cache_size=100000):
+        nfa = ThompsonNFA()
+        self.start_state, self.accept_state = nfa.from_tokens(tokens)
+        self.closures = self._epsilon_closures(nfa)
+
+        # moves[char][state] = closure of the targets of state on char
+        self.moves = {}
+        for state, edges in enumerate(nfa.char_edges):
+            for char, target in edges:
+                by_state = self.moves.setdefault(char, {})
+                by_state[state] = by_state.get(state, 0) | self.closures[target]
+
+        self.start = self.closures[self.start_state]
+        self.accept_mask = 1 << self.accept_state
+        self.use_dfa = use_dfa
+        self.cache = {}
+        self.cache_size = cache_size
+
+    def _epsilon_closures(self, nfa):
+        closures = []
+        for state in range(len(nfa.epsilon)):
+            closure = 1 << state
+            stack = [state]
+            while stack:
+                for target in nfa.epsilon[stack.pop()]:
+                    if not closure >> target & 1:
+                        closure |= 1 << target
+                        stack.append(target)
+            closures.append(closure)
+        return closures
+
+    def step(self, states, char):
+        by_state = self.moves.get(char)
+        if by_state is None:
+            return 0
+        next_states = 0
+        remaining = states
+        while remaining:
+            lowest = remaining & -remaining
+            next_states |= by_state.get(lowest.bit_length() - 1, 0)
+            remaining ^= lowest
+        return next_states
+
+    def cached_step(self, states, char):
+        key = (states, char)
+        next_states = self.cache.get(key)
+        if next_states is None:
+            next_states = self.step(states, char)
+            if len(self.cache) >= self.cache_size:
+                self.cache.clear()
+            self.cache[key] = next_states
+        return next_states
+
+    def match(self, text):
+        step = self.cached_step if self.use_dfa else self.step
+        states = self.start
+        for char in text:
+            states = step(states, char)
+            if not states:
+                return False
+        return bool(states & self.accept_mask)
+
+    def match_many(self, texts):
+        return [self.match(text) for text in texts]
+
+
+def compile_pattern(pattern, use_dfa=True):
+    return CompiledRegex(RegexParser().parse(pattern), use_dfa=use_dfa)
@@ -1,73 +1,65 @@
-import re
+from regex_ast import Alt, Char, Group, Repeat, Concat, group_options, parse_regex
 from regex_logger import RegexLogger
 
 
 class RegexParser:
-    def __init__(self):
+    def __init__(self, logger=None):
         self.tokens = []
-        self.logger = RegexLogger()
+        self.logger = logger if logger is not None else RegexLogger()
+
+    def parse_ast(self, pattern):
+        # Parsed trees are cached per pattern, so repeated patterns in a
+        # batch are only parsed once
+        return parse_regex(pattern)
 
     def parse(self, pattern):
-        self.logger = RegexLogger() 
-        self.logger.process(f"Parsing pattern: {pattern}")
+        self.logger.clear()
+        self.logger.process("Parsing pattern: %s", pattern)
         self.tokens = []
-        i = 0
 
-        while i < len(pattern):
-            char = pattern[i]
+        with self.logger.timed("parse"):
+            self._flatten(pattern, self.parse_ast(pattern))
+        return self.tokens
+
+    def _flatten(self, pattern, ast):
+        items = ast.items if isinstance(ast, Concat) else (ast,)
+        debug = self.logger.debug
+
+        for node in items:
+            start, end = node.span
+            text = pattern[start:end]
 
-            # Handle groupings
-            if char == "(":
-                group_end = pattern.find(")", i)
-                if group_end != -1:
-                    # Check if followed by repetition
-                    if group_end + 1 < len(pattern) and pattern[group_end + 1] == "^":
-                        match = re.match(r"\((.*?)\)\^\{(\d+)\}", pattern[i:])
-                        if match:
-                            group_content = match.group(1).split('|')
-                            repetition = int(match.group(2))
-                            self.tokens.append(('group', (group_content, repetition)))
-                            i += len(match.group(0))
-                            self.logger.process(f"Found group with repetition: {match.group(0)}")
-                            continue
-                    # Simple group with modifiers
-                    elif group_end + 1 < len(pattern) and pattern[group_end + 1] in "?*+":
-                        group_content = pattern[i + 1:group_end].split('|')
-                        modifier = pattern[group_end + 1]
-                        self.tokens.append(('group_mod', (group_content, modifier)))
-                        i = group_end + 2
-                        self.logger.process(f"Found group with modifier: ({pattern[i + 1:group_end]}){modifier}")
-                        continue
-                    else:
-                        # Simple group without modifiers
-                        self.logger.process(f"Found simple group: ({pattern[i + 1:group_end]})")
-                        group_content = pattern[i + 1:group_end].split('|')
-                        self.tokens.append(('group', (group_content, 1)))
-                        i = group_end + 1
-                        continue
+            if isinstance(node, Char):
+                # Simple character
+                self.tokens.append(('char', node.value))
+                debug("Found simple character: %s", node.value)
 
-            # Character with repetition
-            if i + 1 < len(pattern) and pattern[i + 1] == "^":
-                match = re.match(r"(\w)\^\{(\d+)\}", pattern[i:])
-                if match:
-                    char = match.group(1)
-                    repetition = int(match.group(2))
-                    self.tokens.append(('char_rep', (char, repetition)))
-                    i += len(match.group(0))
-                    self.logger.process(f"Found character with repetition: {match.group(0)}")
-                    continue
+            elif isinstance(node, Repeat) and isinstance(node.node, Char):
+                char = node.node.value
+                if node.count is not None:
+                    # Character with repetition
+                    self.tokens.append(('char_rep', (char, node.count)))
+                    debug("Found character with repetition: %s", text)
+                else:
+                    # Character with modifier (?, *, +)
+                    self.tokens.append(('char_mod', (char, node.modifier)))
+                    debug("Found character with modifier: %s", text)
 
-            # Character with modifier (?, *, +)
-            if i + 1 < len(pattern) and pattern[i + 1] in "?*+":
-                modifier = pattern[i + 1]
-                self.tokens.append(('char_mod', (char, modifier)))
-                i += 2
-                self.logger.process(f"Found character with modifier: {char}{modifier}")
-                continue
+            elif isinstance(node, Repeat):
+                group_content = group_options(node.node.body)
+                if node.count is not None:
+                    self.tokens.append(('group', (group_content, node.count)))
+                    debug("Found group with repetition: %s", text)
+                else:
+                    self.tokens.append(('group_mod', (group_content, node.modifier)))
+                    debug("Found group with modifier: %s", text)
 
-            # Simple character
-            self.tokens.append(('char', char))
-            self.logger.process(f"Found simple character: {char}")
-            i += 1
+            elif isinstance(node, Group):
+                # Simple group without modifiers
+                self.tokens.append(('group', (group_options(node.body), 1)))
+                debug("Found simple group: %s", text)
 
-        return self.tokens
\ No newline at end of file
+            elif isinstance(node, Alt):
+                # Alternation at the top level acts as one group
+                self.tokens.append(('group', (group_options(node), 1)))
+                debug("Found top-level alternation: %s", text)
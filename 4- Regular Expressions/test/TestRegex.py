@@ -0,0 +1,138 @@
+import itertools
+import os
+import re
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from regex_ast import Char, Concat, Group, Repeat, Alt, expand, parse_regex
+from regex_generator import RegexGenerator, lazy_product, iter_combination_range
+from regex_logger import RegexLogger
+from regex_matcher import CompiledRegex, compile_pattern
+from regex_parser import RegexParser
+
+PATTERNS = [
+    "ab",
+    "a?b*",
+    "(a|b)(c|d)e+g?",
+    "a(b|c)^{2}d",
+    "(ab|c)*d",
+    "x(a|bc)+y?",
+    "a^{3}(b|c)?",
+]
+
+# Every word up to length 6 over this alphabet is checked against re
+MATCHER_ALPHABET = "abcd"
+
+
+def to_python_regex(pattern):
+    # The lab syntax differs from re only in the ^{n} repetition
+    return pattern.replace('^{', '{')
+
+
+class TestRegex(unittest.TestCase):
+    def setUp(self):
+        quiet = RegexLogger(level=RegexLogger.OFF)
+        self.parser = RegexParser(quiet)
+        self.generator = RegexGenerator(quiet)
+
+    def test_lazy_product_matches_itertools(self):
+        parts = [['', 'a'], ['b', 'c', 'd'], ['x']]
+        expected = [''.join(combo) for combo in itertools.product(*parts)]
+        self.assertEqual(list(lazy_product(parts)), expected)
+        self.assertEqual(list(lazy_product([['a'], []])), [])
+
+    def test_count_matches_enumeration(self):
+        for pattern in PATTERNS:
+            tokens = self.parser.parse(pattern)
+            combinations = list(self.generator.generate_iter(tokens))
+            self.assertEqual(self.generator.count(tokens), len(combinations), pattern)
+
+    def test_nth_and_sample_match_enumeration(self):
+        for pattern in PATTERNS:
+            tokens = self.parser.parse(pattern)
+            combinations = list(self.generator.generate_iter(tokens))
+            for k, combination in enumerate(combinations):
+                self.assertEqual(self.generator.nth(tokens, k), combination, (pattern, k))
+            with self.assertRaises(IndexError):
+                self.generator.nth(tokens, len(combinations))
+
+            parts = self.generator.build_parts(tokens)
+            self.assertEqual(list(iter_combination_range(parts, 1, len(combinations))), combinations[1:])
+
+            for n in (0, 1, len(combinations) // 2, len(combinations)):
+                sample = self.generator.sample(tokens, n, seed=n)
+                self.assertEqual(len(sample), n)
+                indices = [combinations.index(s) for s in sample]
+                self.assertEqual(indices, sorted(set(indices)))
+            with self.assertRaises(ValueError):
+                self.generator.sample(tokens, len(combinations) + 1)
+
+    def test_parallel_matches_sequential(self):
+        tokens = self.parser.parse("(a|b)(c|d)e+g?")
+        expected = list(self.generator.generate_iter(tokens))
+
+        with tempfile.TemporaryDirectory() as out_dir:
+            paths = self.generator.generate_parallel(tokens, workers=2, out_dir=out_dir, shards=5)
+            self.assertEqual(len(paths), 5)
+            lines = []
+            for path in sorted(paths):
+                with open(path) as f:
+                    lines.extend(f.read().splitlines())
+            self.assertEqual(lines, expected)
+
+            merged = self.generator.generate_parallel(tokens, workers=2, out_dir=out_dir, shards=3, merge=True)
+            with open(merged[0]) as f:
+                self.assertEqual(f.read().splitlines(), expected)
+
+    def test_ast(self):
+        ast = parse_regex("a(b|c)*")
+        self.assertEqual(ast, Concat((
+            Char('a', (0, 1)),
+            Repeat(Group(Alt((Concat((Char('b', (2, 3)),), (2, 3)),
+                              Concat((Char('c', (4, 5)),), (4, 5))), (2, 5)), (1, 6)),
+                   '*', None, (1, 7)),
+        ), (0, 7)))
+
+        self.assertEqual(parse_regex("b^{3}").items[0].count, 3)
+        # '^' without a well-formed count is a literal
+        self.assertEqual([node.value for node in parse_regex("a^b").items], ['a', '^', 'b'])
+        self.assertEqual(sorted(expand(parse_regex("(a|bc)?d"))), ['ad', 'bcd', 'd'])
+
+        with self.assertRaises(ValueError):
+            parse_regex("(ab")
+        with self.assertRaises(ValueError):
+            parse_regex("ab)")
+
+    def test_tokens(self):
+        self.assertEqual(self.parser.parse("a(b|c)^{2}d+e?"), [
+            ('char', 'a'),
+            ('group', (['b', 'c'], 2)),
+            ('char_mod', ('d', '+')),
+            ('char_mod', ('e', '?')),
+        ])
+
+    def test_matcher_agrees_with_re(self):
+        words = [''.join(letters) for length in range(7)
+                 for letters in itertools.product(MATCHER_ALPHABET, repeat=length)]
+        for pattern in PATTERNS:
+            expected = re.compile(to_python_regex(pattern))
+            tokens = self.parser.parse(pattern)
+            # Generated combinations cover the letters outside the alphabet
+            extra = list(itertools.islice(self.generator.generate_iter(tokens), 200))
+            for use_dfa in (True, False):
+                matcher = CompiledRegex(tokens, use_dfa=use_dfa)
+                for word in words + extra + [word + 'z' for word in extra]:
+                    self.assertEqual(matcher.match(word), bool(expected.fullmatch(word)),
+                                     (pattern, use_dfa, word))
+
+    def test_compile_pattern(self):
+        matcher = compile_pattern("(ab|c)*d")
+        self.assertEqual(matcher.match_many(["d", "abcd", "abd", "ab", "abababcccd"]),
+                         [True, True, True, False, True])
+
+
+if __name__ == '__main__':
+    unittest.main()
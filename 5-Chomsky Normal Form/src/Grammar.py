@@ -1,12 +1,69 @@
-from itertools import chain, combinations
+import time
+from contextlib import contextmanager
+
+from conversion_report import ConversionReport, PrintingObserver, StageReport
+from grammar_analysis import GrammarAnalysis
+from incremental_conversion import IncrementalConversion
+from symbols import SymbolTable
 
 class Grammar:
-    def __init__(self, non_terminals, terminals, productions, start_symbol):
+    def __init__(self, non_terminals, terminals, productions, start_symbol, quiet=False, observers=None):
+        # Symbols are interned to ints and productions kept as tuples of ids
+        # in self.rules; the name-based attributes below are views over them
+        self.symbols = SymbolTable()
+        for name in sorted(non_terminals) + sorted(terminals):
+            self.symbols.intern(name)
         self.non_terminals = non_terminals
         self.terminals = terminals
         self.productions = productions
         self.start_symbol = start_symbol
         self.N_lambda = set()
+        # Productions before conversion, kept for apply_delta
+        self.source_rules = None
+        self.source_non_terminals = None
+        self._incremental = None
+        # quiet drops the console printer; observers receive stage reports
+        self.observers = list(observers or [])
+        if not quiet:
+            self.observers.insert(0, PrintingObserver())
+        self.report = ConversionReport(self)
+
+    @property
+    def non_terminals(self):
+        return self._names(self.nt_ids)
+
+    @non_terminals.setter
+    def non_terminals(self, names):
+        self.nt_ids = {self.symbols.intern(name) for name in names}
+
+    @property
+    def terminals(self):
+        return self._names(self.terminal_ids)
+
+    @terminals.setter
+    def terminals(self, names):
+        self.terminal_ids = {self.symbols.intern(name) for name in names}
+
+    @property
+    def start_symbol(self):
+        return self.symbols.name(self.start_id)
+
+    @start_symbol.setter
+    def start_symbol(self, name):
+        self.start_id = self.symbols.intern(name)
+
+    @property
+    def productions(self):
+        decode = self.symbols.decode
+        return {self.symbols.name(nt): [decode(prod) for prod in prods] for nt, prods in self.rules.items()}
+
+    @productions.setter
+    def productions(self, productions):
+        encode = self.symbols.encode
+        self.rules = {self.symbols.intern(nt): [encode(prod) for prod in prods] for nt, prods in productions.items()}
+
+    def _names(self, symbol_ids):
+        return {self.symbols.name(symbol_id) for symbol_id in symbol_ids}
 
     def print_grammar(self, message="Current grammar:"):
         print(f"\n{message}")
@@ -18,243 +75,295 @@ class Grammar:
             print(f"  {nt} -> {' | '.join(prods)}")
         print()
 
+    def analyze(self):
+        # Nullable, productive, reachable and unit-pair sets of the current rules
+        return GrammarAnalysis(self.rules, self.terminal_ids, self.start_id, self.nt_ids)
+
+    def _production_count(self):
+        return sum(len(prods) for prods in self.rules.values())
+
+    def _notify(self, event, *args):
+        for observer in self.observers:
+            getattr(observer, event)(*args, self)
+
+    @contextmanager
+    def _stage(self, name, title, result_message):
+        stage = StageReport(name, title, result_message)
+        stage.productions_before = self._production_count()
+        stage.non_terminals_before = len(self.nt_ids)
+        self._notify("stage_started", stage)
+
+        start = time.perf_counter()
+        yield stage
+        stage.elapsed = time.perf_counter() - start
+
+        stage.productions_after = self._production_count()
+        stage.non_terminals_after = len(self.nt_ids)
+        self.report.stages.append(stage)
+        self._notify("stage_finished", stage)
+
     def eliminate_empty_productions(self):
-        print("\nStep 1: Eliminating epsilon productions")
-        
-        N_lambda = set()
-        
-        for nt, prods in self.productions.items():
-            if "ε" in prods or "epsilon" in prods:
-                N_lambda.add(nt)
-        
-        changed = True
-        while changed:
-            changed = False
-            for nt, prods in self.productions.items():
-                if nt in N_lambda:
-                    continue
-                
-                for prod in prods:
-                    if all(symbol in N_lambda for symbol in prod):
-                        N_lambda.add(nt)
-                        changed = True
-                        break
-        
-        self.N_lambda = N_lambda
-        print(f"Nullable non-terminals: {N_lambda}")
-        
-        new_productions = {nt: [] for nt in self.productions}
-        
-        for nt, prods in self.productions.items():
-            for prod in prods:
-                if prod == "ε" or prod == "epsilon":
-                    continue
-                
-                nullable_positions = []
-                for i, symbol in enumerate(prod):
-                    if symbol in N_lambda:
-                        nullable_positions.append(i)
-                
-                all_subsets = chain.from_iterable(
-                    combinations(nullable_positions, r) 
-                    for r in range(len(nullable_positions) + 1)
-                )
-                
-                for subset in all_subsets:
-                    new_prod = "".join(symbol for i, symbol in enumerate(prod) if i not in subset)
-                    
-                    if new_prod and new_prod not in new_productions[nt]:
-                        new_productions[nt].append(new_prod)
-        
-        self.productions = new_productions
-        
-        self.productions = {nt: prods for nt, prods in self.productions.items() if prods}
-        
-        self.print_grammar("Grammar after eliminating epsilon productions:")
+        with self._stage("eliminate_empty_productions", "Step 1: Eliminating epsilon productions",
+                         "Grammar after eliminating epsilon productions:") as stage:
+            self._eliminate_empty_productions(stage)
         return self
 
+    def _eliminate_empty_productions(self, stage):
+        N_lambda = self.analyze().nullable
+
+        self.N_lambda = self._names(N_lambda)
+        stage.details["Nullable non-terminals"] = self.N_lambda
+
+        new_rules = {}
+
+        for nt, prods in self.rules.items():
+            new_prods = []
+            seen = set()
+
+            for prod in prods:
+                for new_prod in self._variants(prod, N_lambda):
+                    if new_prod not in seen:
+                        seen.add(new_prod)
+                        new_prods.append(new_prod)
+
+            if new_prods:
+                new_rules[nt] = new_prods
+
+        self.rules = new_rules
+
+    @staticmethod
+    def _variants(prod, nullable):
+        # prod with every subset of its nullable symbols left out, except
+        # the empty production. Each nullable symbol doubles the variants,
+        # so this stays small once productions are binary
+        # (convert_to_binary_form runs first in the full conversion).
+        variants = [()]
+        for symbol in prod:
+            extended = [variant + (symbol,) for variant in variants]
+            variants = extended + variants if symbol in nullable else extended
+        return [variant for variant in variants if variant]
+
     def eliminate_unit_productions(self):
-        print("\nStep 2: Eliminating unit productions (renaming)")
-        
-        unit_pairs = {nt: {nt} for nt in self.non_terminals}
-        
-        changed = True
-        while changed:
-            changed = False
-            for A in self.non_terminals:
-                for prod in self.productions.get(A, []):
-                    if prod in self.non_terminals:
-                        B = prod
-                        for C in unit_pairs.get(B, set()):
-                            if C not in unit_pairs[A]:
-                                unit_pairs[A].add(C)
-                                changed = True
-        
-        print("Unit pairs:", unit_pairs)
-        
-        new_productions = {nt: [] for nt in self.non_terminals}
-        
-        for A in self.non_terminals:
-            for B in unit_pairs[A]:
-                for prod in self.productions.get(B, []):
-                    if prod not in self.non_terminals and prod not in new_productions[A]:
-                        new_productions[A].append(prod)
-        
-        self.productions = new_productions
-        
-        self.productions = {nt: prods for nt, prods in self.productions.items() if prods}
-        
-        self.print_grammar("Grammar after eliminating unit productions:")
+        with self._stage("eliminate_unit_productions", "Step 2: Eliminating unit productions (renaming)",
+                         "Grammar after eliminating unit productions:") as stage:
+            self._eliminate_unit_productions(stage)
         return self
 
+    def _eliminate_unit_productions(self, stage):
+        nts = self.nt_ids
+        unit_pairs = self.analyze().unit_pairs
+
+        stage.details["Unit pairs"] = {self.symbols.name(A): self._names(Bs) for A, Bs in unit_pairs.items()}
+
+        new_rules = {}
+
+        for A in nts:
+            new_prods = []
+            seen = set()
+            for B in unit_pairs[A]:
+                for prod in self.rules.get(B, []):
+                    is_unit = len(prod) == 1 and prod[0] in nts
+                    if not is_unit and prod not in seen:
+                        seen.add(prod)
+                        new_prods.append(prod)
+            if new_prods:
+                new_rules[A] = new_prods
+
+        self.rules = new_rules
+
     def eliminate_inaccessible_symbols(self):
-        print("\nStep 3: Eliminating inaccessible symbols")
-        
-        accessible = {self.start_symbol}
-        queue = [self.start_symbol]
-        
-        while queue:
-            current = queue.pop(0)
-            for prod in self.productions.get(current, []):
-                for symbol in prod:
-                    if symbol in self.non_terminals and symbol not in accessible:
-                        accessible.add(symbol)
-                        queue.append(symbol)
-        
-        print(f"Accessible non-terminals: {accessible}")
-        
-        inaccessible = self.non_terminals - accessible
-        print(f"Inaccessible non-terminals being removed: {inaccessible}")
-        
-        self.non_terminals = accessible
-        self.productions = {nt: prods for nt, prods in self.productions.items() if nt in accessible}
-        
-        self.print_grammar("Grammar after eliminating inaccessible symbols:")
+        with self._stage("eliminate_inaccessible_symbols", "Step 3: Eliminating inaccessible symbols",
+                         "Grammar after eliminating inaccessible symbols:") as stage:
+            self._eliminate_inaccessible_symbols(stage)
         return self
 
+    def _eliminate_inaccessible_symbols(self, stage):
+        accessible = self.analyze().reachable
+
+        stage.details["Accessible non-terminals"] = self._names(accessible)
+
+        inaccessible = self.nt_ids - accessible
+        stage.details["Inaccessible non-terminals being removed"] = self._names(inaccessible)
+
+        self.nt_ids = accessible
+        self.rules = {nt: prods for nt, prods in self.rules.items() if nt in accessible}
+
     def eliminate_non_productive_symbols(self):
-        print("\nStep 4: Eliminating non-productive symbols")
-        
-        productive = set()
-        
-        for nt, prods in self.productions.items():
-            for prod in prods:
-                if all(symbol in self.terminals for symbol in prod):
-                    productive.add(nt)
-                    break
-        
-        changed = True
-        while changed:
-            changed = False
-            for nt, prods in self.productions.items():
-                if nt in productive:
-                    continue
-                
-                for prod in prods:
-                    if all(symbol in self.terminals or symbol in productive for symbol in prod):
-                        productive.add(nt)
-                        changed = True
-                        break
-        
-        print(f"Productive non-terminals: {productive}")
-        
-        non_productive = self.non_terminals - productive
-        print(f"Non-productive non-terminals being removed: {non_productive}")
-        
-        self.non_terminals = productive
-        
-        new_productions = {}
-        for nt in productive:
-            new_productions[nt] = []
-            for prod in self.productions.get(nt, []):
-                if all(symbol not in self.non_terminals or symbol in productive for symbol in prod):
-                    new_productions[nt].append(prod)
-        
-        self.productions = new_productions
-        
-        self.productions = {nt: prods for nt, prods in self.productions.items() if prods}
-        
-        self.print_grammar("Grammar after eliminating non-productive symbols:")
+        with self._stage("eliminate_non_productive_symbols", "Step 4: Eliminating non-productive symbols",
+                         "Grammar after eliminating non-productive symbols:") as stage:
+            self._eliminate_non_productive_symbols(stage)
         return self
 
+    def _eliminate_non_productive_symbols(self, stage):
+        productive = self.analyze().productive
+
+        stage.details["Productive non-terminals"] = self._names(productive)
+
+        non_productive = self.nt_ids - productive
+        stage.details["Non-productive non-terminals being removed"] = self._names(non_productive)
+
+        new_rules = {}
+        for nt in productive:
+            new_rules[nt] = []
+            for prod in self.rules.get(nt, []):
+                if not any(symbol in non_productive for symbol in prod):
+                    new_rules[nt].append(prod)
+
+        self.nt_ids = productive
+        self.rules = {nt: prods for nt, prods in new_rules.items() if prods}
+
     def convert_to_binary_form(self):
-        print("\nConverting productions to binary form")
-        
-        new_productions = {}
-        new_non_terminals = set(self.non_terminals)
-        next_nt_index = 1
-        
-        for nt, prods in self.productions.items():
-            new_productions[nt] = []
-            
-            for prod in prods:
-                if len(prod) <= 2:
-                    new_productions[nt].append(prod)
-                else:
-                    symbols = list(prod)
-                    current_nt = nt
-                    
-                    while len(symbols) > 2:
-                        first = symbols.pop(0)
-                        
-                        new_nt = f"X{next_nt_index}"
-                        next_nt_index += 1
-                        new_non_terminals.add(new_nt)
-                        
-                        new_productions[current_nt] = new_productions.get(current_nt, []) + [first + new_nt]
-                        current_nt = new_nt
-                    
-                    new_productions[current_nt] = new_productions.get(current_nt, []) + ["".join(symbols)]
-        
-        self.non_terminals = new_non_terminals
-        self.productions = new_productions
-        
-        self.print_grammar("Grammar after converting to binary form:")
+        with self._stage("convert_to_binary_form", "Converting productions to binary form",
+                         "Grammar after converting to binary form:") as stage:
+            self._convert_to_binary_form(stage)
         return self
 
+    def _convert_to_binary_form(self, stage):
+        new_rules = {}
+        new_nts = set(self.nt_ids)
+        seen = set()
+
+        for nt, prods in self.rules.items():
+            new_rules.setdefault(nt, [])
+
+            for prod in prods:
+                for head, binary in self._binarize(nt, prod):
+                    if (head, binary) not in seen:
+                        seen.add((head, binary))
+                        if head != nt:
+                            new_nts.add(head)
+                        new_rules.setdefault(head, []).append(binary)
+
+        self.nt_ids = new_nts
+        self.rules = new_rules
+
+    def _binarize(self, nt, prod):
+        # A -> s1 s2 ... sk becomes A -> s1 <s2 ... sk>, <s2 ... sk> -> s2 <s3 ... sk>
+        # and so on. The new non-terminals are named after the suffix they
+        # derive, so equal suffixes share one and names do not depend on
+        # the order productions are processed in.
+        rules = []
+        head = nt
+        for i in range(len(prod) - 2):
+            suffix = self._suffix_symbol(prod[i + 1:])
+            rules.append((head, (prod[i], suffix)))
+            head = suffix
+        rules.append((head, prod[-2:]))
+        return rules
+
+    def _suffix_symbol(self, suffix):
+        names = " ".join(self.symbols.name(symbol) for symbol in suffix)
+        return self.symbols.intern(f"<{names}>")
+
     def convert_terminal_mixed_productions(self):
-        print("\nConverting terminal-mixed productions")
-        
-        new_productions = {}
-        new_non_terminals = set(self.non_terminals)
+        with self._stage("convert_terminal_mixed_productions", "Converting terminal-mixed productions",
+                         "Grammar after converting terminal-mixed productions:") as stage:
+            self._convert_terminal_mixed_productions(stage)
+        return self
+
+    def _convert_terminal_mixed_productions(self, stage):
+        new_rules = {}
+        new_nts = set(self.nt_ids)
         terminal_non_terminals = {}
-        
-        for terminal in self.terminals:
-            new_nt = f"T_{terminal}"
+
+        for terminal in sorted(self.terminal_ids):
+            new_nt = self._terminal_symbol(terminal)
             terminal_non_terminals[terminal] = new_nt
-            new_non_terminals.add(new_nt)
-            new_productions[new_nt] = [terminal]
-        
-        for nt, prods in self.productions.items():
-            new_productions[nt] = new_productions.get(nt, [])
-            
+            new_nts.add(new_nt)
+            new_rules[new_nt] = [(terminal,)]
+
+        for nt, prods in self.rules.items():
+            new_rules[nt] = new_rules.get(nt, [])
+
             for prod in prods:
-                if len(prod) == 1:
-                    new_productions[nt].append(prod)
-                else:
-                    new_prod = ""
-                    for symbol in prod:
-                        if symbol in self.terminals:
-                            new_prod += terminal_non_terminals[symbol]
-                        else:
-                            new_prod += symbol
-                    new_productions[nt].append(new_prod)
-        
-        self.non_terminals = new_non_terminals
-        self.productions = new_productions
-        
-        self.print_grammar("Grammar after converting terminal-mixed productions:")
-        return self
+                new_rules[nt].append(self._replace_terminals(prod, terminal_non_terminals))
+
+        self.nt_ids = new_nts
+        self.rules = new_rules
+
+    def _terminal_symbol(self, terminal):
+        return self.symbols.intern(f"T_{self.symbols.name(terminal)}")
+
+    @staticmethod
+    def _replace_terminals(prod, terminal_non_terminals):
+        if len(prod) == 1:
+            return prod
+        return tuple(terminal_non_terminals.get(symbol, symbol) for symbol in prod)
+
+    def _save_source(self):
+        # Keeps the productions about to be converted for apply_delta
+        self.source_rules = {nt: list(prods) for nt, prods in self.rules.items()}
+        self.source_non_terminals = set(self.nt_ids)
+        self._incremental = None
 
     def convert_to_chomsky_normal_form(self):
-        print("\nConverting grammar to Chomsky Normal Form")
-        
+        # Returns a ConversionReport; the converted grammar is self
+        self._save_source()
+        self.report = ConversionReport(self)
+        self._notify("conversion_started")
+
+        start = time.perf_counter()
+        # BIN before DEL: with at most two symbols per production, epsilon
+        # elimination adds at most three variants instead of 2^k
+        self.convert_to_binary_form()
         self.eliminate_empty_productions()
         self.eliminate_unit_productions()
         self.eliminate_inaccessible_symbols()
         self.eliminate_non_productive_symbols()
-        self.convert_to_binary_form()
         self.convert_terminal_mixed_productions()
-        
-        print("\nConversion to Chomsky Normal Form complete!")
-        return self
\ No newline at end of file
+        self.report.elapsed = time.perf_counter() - start
+
+        self._notify("conversion_finished", self.report)
+        return self.report
+
+    def apply_delta(self, added=None, removed=None):
+        # Adds and removes source productions, given like the constructor's
+        # productions ({"A": ["aB", "ε"]}), and updates the converted
+        # grammar without rerunning the stages: only facts and productions
+        # affected by the change are recomputed. The result has the same
+        # non-terminals and productions as converting the changed source
+        # grammar from scratch. Observers are not notified. Returns the
+        # names of the non-terminals whose productions changed.
+        if self.source_rules is None:
+            raise ValueError("apply_delta needs a grammar converted with convert_to_chomsky_normal_form")
+
+        added = self._encode_delta(added)
+        removed = self._encode_delta(removed)
+        for nt, prod in removed:
+            if prod not in self.source_rules.get(nt, ()):
+                raise ValueError(f"{self.symbols.name(nt)} -> {self.symbols.decode(prod)} is not in the grammar")
+
+        for nt, prod in removed:
+            self.source_rules[nt].remove(prod)
+        for nt, prod in added:
+            self.source_rules.setdefault(nt, []).append(prod)
+
+        new_non_terminals = {nt for nt, _ in added} - self.source_non_terminals
+        if new_non_terminals:
+            # A new non-terminal can turn existing productions into unit
+            # productions, so the incremental state is rebuilt
+            self.source_non_terminals |= new_non_terminals
+            self._incremental = None
+
+        if self._incremental is None:
+            self._incremental = IncrementalConversion(self, self.source_rules, self.source_non_terminals)
+            changed = set(self._incremental.output) | set(self.rules)
+            self.rules = {}
+        else:
+            changed = self._incremental.apply(added, removed)
+
+        output = self._incremental.output
+        for nt in changed:
+            if nt in output:
+                self.rules[nt] = list(output[nt])
+            else:
+                self.rules.pop(nt, None)
+        self.nt_ids = set(self._incremental.output_non_terminals)
+        self.N_lambda = self._names(self._incremental.nullable.facts)
+        return self._names(changed)
+
+    def _encode_delta(self, productions):
+        encode = self.symbols.encode
+        return [(self.symbols.intern(nt), encode(prod))
+                for nt, prods in (productions or {}).items() for prod in prods]
+
@@ -0,0 +1,167 @@
+import random
+import sys
+import time
+
+from Grammar import Grammar
+from string_grammar import StringGrammar
+
+
+def random_grammar(non_terminal_count, terminal_count, productions_per_symbol, max_length, seed,
+                   grammar_class=Grammar, single_char=False):
+    # Multi-character names (N12, t3) so the benchmark exercises symbol
+    # interning rather than one-letter strings. single_char names every
+    # symbol with one character instead, as StringGrammar needs.
+    rng = random.Random(seed)
+    if single_char:
+        non_terminals = [chr(0x4E00 + i) for i in range(non_terminal_count)]
+        terminals = [chr(0xAC00 + i) for i in range(terminal_count)]
+    else:
+        non_terminals = [f"N{i}" for i in range(non_terminal_count)]
+        terminals = [f"t{i}" for i in range(terminal_count)]
+    symbols = non_terminals + terminals
+
+    productions = {}
+    for nt in non_terminals:
+        prods = [rng.choice(terminals)]
+        for _ in range(productions_per_symbol - 1):
+            length = rng.randint(2, max_length)
+            prods.append("".join(rng.choice(symbols) for _ in range(length)))
+        if rng.random() < 0.2:
+            prods.append(rng.choice(non_terminals))
+        if rng.random() < 0.1:
+            prods.append("ε")
+        productions[nt] = prods
+
+    return grammar_class(set(non_terminals), set(terminals), productions, non_terminals[0], quiet=True)
+
+
+def adversarial_grammar(nullable_count):
+    # S -> A0 A1 ... Ak-1 with every Ai nullable: eliminating epsilon
+    # productions before binarizing yields 2^k variants of that one rule
+    non_terminals = ["S"] + [f"A{i}" for i in range(nullable_count)]
+    terminals = [f"a{i}" for i in range(nullable_count)]
+    productions = {"S": ["".join(non_terminals[1:])]}
+    for i in range(nullable_count):
+        productions[f"A{i}"] = [f"a{i}", "ε"]
+    return Grammar(set(non_terminals), set(terminals), productions, "S", quiet=True)
+
+
+def del_before_bin(grammar):
+    # The previous stage order, for comparison
+    start = time.perf_counter()
+    grammar.eliminate_empty_productions()
+    grammar.eliminate_unit_productions()
+    grammar.eliminate_inaccessible_symbols()
+    grammar.eliminate_non_productive_symbols()
+    grammar.convert_to_binary_form()
+    grammar.convert_terminal_mixed_productions()
+    return time.perf_counter() - start
+
+
+def benchmark_adversarial(nullable_counts, max_del_first=12):
+    # With BIN first the grammar after DEL grows linearly with the nullable
+    # count. The final CNF is still quadratic: binarizing gives a chain of
+    # suffix non-terminals <Ai ... Ak-1>, each with unit productions to
+    # every later suffix, and UNIT copies those productions down the chain.
+    # Every suffix derives each single terminal after it, so strict CNF
+    # needs that many terminal productions per suffix.
+    print(f"{'nullable':>8} {'DEL prods':>10} {'CNF prods':>10} {'BIN first s':>12} {'DEL first s':>12}")
+
+    for count in nullable_counts:
+        grammar = adversarial_grammar(count)
+        start = time.perf_counter()
+        report = grammar.convert_to_chomsky_normal_form()
+        elapsed = time.perf_counter() - start
+        after_del = report.stage("eliminate_empty_productions").productions_after
+        after = sum(len(prods) for prods in grammar.rules.values())
+
+        # DEL first is exponential, so only run it for small counts
+        del_first = f"{del_before_bin(adversarial_grammar(count)):>12.3f}" if count <= max_del_first else f"{'-':>12}"
+        print(f"{count:>8} {after_del:>10} {after:>10} {elapsed:>12.3f} {del_first}")
+
+
+def benchmark_incremental(sizes, delta_count=20):
+    # Full conversion versus apply_delta with one production added and
+    # one removed per delta
+    print(f"{'NTs':>6} {'full s':>8} {'first delta s':>14} {'delta ms':>9}")
+
+    for size in sizes:
+        grammar = random_grammar(size, max(2, size // 10), 6, 4, seed=size)
+        start = time.perf_counter()
+        grammar.convert_to_chomsky_normal_form()
+        full = time.perf_counter() - start
+
+        rng = random.Random(size)
+        names = sorted(grammar.symbols.name(nt) for nt in grammar.source_non_terminals)
+        symbols = names + sorted(grammar.terminals)
+
+        def delta():
+            nt = rng.choice(sorted(grammar.source_rules))
+            removed = grammar.symbols.decode(rng.choice(grammar.source_rules[nt]))
+            added = "".join(rng.choice(symbols) for _ in range(rng.randint(2, 4)))
+            grammar.apply_delta({rng.choice(names): [added]}, {grammar.symbols.name(nt): [removed]})
+
+        # The first delta builds the incremental state
+        start = time.perf_counter()
+        delta()
+        first = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(delta_count):
+            delta()
+        per_delta = (time.perf_counter() - start) / delta_count
+
+        print(f"{size:>6} {full:>8.3f} {first:>14.3f} {per_delta * 1000:>9.2f}")
+
+
+def benchmark(shapes, max_length=4):
+    # shapes are (non-terminals, productions per non-terminal) pairs. The
+    # string-based stages (StringGrammar) and the interned ones, run in
+    # the same DEL-first order, convert the same grammars with
+    # one-character symbol names; "pipeline s" is the current BIN-first
+    # convert_to_chomsky_normal_form, broken down by stage on the right.
+    # StringGrammar splits its generated X1, X2 names into characters, so
+    # it does not produce the same CNF, only comparable work.
+    stage_names = None
+
+    for size, productions_per_symbol in shapes:
+        def generate(grammar_class=Grammar):
+            return random_grammar(size, max(2, size // 10), productions_per_symbol, max_length, seed=size,
+                                  grammar_class=grammar_class, single_char=True)
+
+        baseline = generate(StringGrammar)
+        start = time.perf_counter()
+        baseline.convert_to_chomsky_normal_form()
+        string_elapsed = time.perf_counter() - start
+
+        interned_elapsed = del_before_bin(generate())
+
+        grammar = generate()
+        before = sum(len(prods) for prods in grammar.rules.values())
+        start = time.perf_counter()
+        report = grammar.convert_to_chomsky_normal_form()
+        elapsed = time.perf_counter() - start
+
+        if stage_names is None:
+            stage_names = [stage.name for stage in report.stages]
+            print(f"{'NTs':>6} {'per NT':>6} {'prods':>7} {'string s':>9} {'interned s':>11} {'speedup':>8} "
+                  f"{'pipeline s':>11} " + " ".join(f"{name.split('_', 1)[1][:12]:>12}" for name in stage_names))
+
+        print(f"{size:>6} {productions_per_symbol:>6} {before:>7} {string_elapsed:>9.3f} {interned_elapsed:>11.3f} "
+              f"{string_elapsed / interned_elapsed:>7.2f}x {elapsed:>11.3f} " +
+              " ".join(f"{stage.elapsed:>12.4f}" for stage in report.stages))
+
+
+if __name__ == "__main__":
+    # Non-terminal counts with six productions each, e.g. `python benchmark_cnf.py 100 500 2000`
+    # (by default also 50 non-terminals with 10 and 20 productions each), or
+    # nullable symbols per rule with `python benchmark_cnf.py --adversarial 8 12 400`,
+    # or apply_delta against full conversion with `--incremental 100 500 2000`
+    args = sys.argv[1:]
+    if args and args[0] == "--adversarial":
+        benchmark_adversarial([int(arg) for arg in args[1:]] or [8, 10, 12, 100, 400])
+    elif args and args[0] == "--incremental":
+        benchmark_incremental([int(arg) for arg in args[1:]] or [100, 500, 2000])
+    else:
+        shapes = [(int(arg), 6) for arg in args] or [(100, 6), (500, 6), (2000, 6), (50, 10), (50, 20)]
+        benchmark(shapes)
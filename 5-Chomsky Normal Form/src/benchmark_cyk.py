@@ -0,0 +1,40 @@
+import random
+import sys
+import time
+
+from Grammar import Grammar
+from cyk_parser import CYKParser
+
+
+def variant_grammar():
+    productions = {
+        "S": ["aB", "DA"],
+        "A": ["a", "BD", "bDAB"],
+        "B": ["b", "BA"],
+        "D": ["ε", "BA"],
+        "C": ["BA"]
+    }
+    grammar = Grammar({"S", "A", "B", "C", "D"}, {"a", "b"}, productions, "S", quiet=True)
+    grammar.convert_to_chomsky_normal_form()
+    return grammar
+
+
+def benchmark(lengths, sentence_count=2000):
+    parser = CYKParser(variant_grammar())
+    rng = random.Random(0)
+    print(f"{'length':>7} {'sentences':>10} {'accepted':>9} {'seconds':>8} {'sentences/s':>12}")
+
+    for length in lengths:
+        sentences = ["".join(rng.choice("ab") for _ in range(length)) for _ in range(sentence_count)]
+
+        start = time.perf_counter()
+        accepted = sum(parser.recognize_many(sentences))
+        elapsed = time.perf_counter() - start
+
+        print(f"{length:>7} {sentence_count:>10} {accepted:>9} {elapsed:>8.3f} {sentence_count / elapsed:>12.0f}")
+
+
+if __name__ == "__main__":
+    # Sentence lengths, e.g. `python benchmark_cyk.py 5 10 20 40`
+    lengths = [int(arg) for arg in sys.argv[1:]] or [5, 10, 20, 40]
+    benchmark(lengths)
@@ -0,0 +1,162 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+from conversion_report import ConversionReport
+
+# Sources whose contents decide the conversion result; editing any of
+# them changes the code version and so invalidates every cached entry
+CODE_FILES = ("Grammar.py", "grammar_analysis.py", "incremental_conversion.py", "symbols.py",
+              "conversion_report.py", "conversion_cache.py")
+
+# Written into every version directory; only directories holding it are
+# removed as stale, never anything else found in the cache directory
+MARKER = ".cnf_cache_version"
+HEX_DIGITS = set("0123456789abcdef")
+
+
+def code_version():
+    directory = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256()
+    for name in CODE_FILES:
+        with open(os.path.join(directory, name), "rb") as f:
+            digest.update(name.encode())
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def grammar_key(grammar):
+    # sha256 of a canonical JSON form: symbol sets sorted, productions as
+    # lists of symbol names in their original order (which decides the
+    # order of the converted productions)
+    name = grammar.symbols.name
+    canonical = {
+        "non_terminals": sorted(grammar.non_terminals),
+        "terminals": sorted(grammar.terminals),
+        "start_symbol": grammar.start_symbol,
+        "productions": {name(nt): [[name(symbol) for symbol in prod] for prod in prods]
+                        for nt, prods in grammar.rules.items()},
+    }
+    text = json.dumps(canonical, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ConversionCache:
+    # On-disk cache of Chomsky Normal Form conversions, one JSON file per
+    # grammar under directory/<code version>/. Entries are evicted least
+    # recently used first (by file mtime, refreshed on every hit) once the
+    # directory grows past max_bytes.
+    def __init__(self, directory=".cnf_cache", max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.version = code_version()[:16]
+        self.root = directory
+        self.directory = os.path.join(directory, self.version)
+        self._make_directory()
+        self._remove_stale_versions()
+        self.hits = 0
+        self.misses = 0
+
+    def _make_directory(self):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, MARKER), "w", encoding="utf-8") as f:
+            f.write(self.version)
+
+    def _remove_stale_versions(self):
+        for entry in os.listdir(self.root):
+            path = os.path.join(self.root, entry)
+            if (entry != self.version and len(entry) == 16 and set(entry) <= HEX_DIGITS
+                    and os.path.isfile(os.path.join(path, MARKER))):
+                shutil.rmtree(path, ignore_errors=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def convert(self, grammar):
+        # Converts grammar in place like convert_to_chomsky_normal_form and
+        # returns its ConversionReport. On a hit the stored result and
+        # stage reports are loaded instead; observers are not notified
+        # because the intermediate grammars are not stored.
+        key = grammar_key(grammar)
+        path = self._path(key)
+
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            entry = None
+
+        if entry is not None:
+            self.hits += 1
+            os.utime(path)
+            # The grammar still holds the source productions the key was
+            # computed from, which apply_delta needs later on
+            grammar._save_source()
+            return self._load(grammar, entry)
+
+        self.misses += 1
+        report = grammar.convert_to_chomsky_normal_form()
+        self._store(path, grammar, report)
+        return report
+
+    def _load(self, grammar, entry):
+        # Stored symbol indexes -> ids in this grammar's symbol table
+        ids = [grammar.symbols.intern(name) for name in entry["symbols"]]
+        grammar.non_terminals = entry["non_terminals"]
+        grammar.terminals = entry["terminals"]
+        grammar.start_symbol = entry["start_symbol"]
+        if ids == list(range(len(ids))):
+            # Same interning order as the stored grammar, the usual case
+            grammar.rules = {nt: [tuple(prod) for prod in prods] for nt, prods in entry["productions"]}
+        else:
+            grammar.rules = {ids[nt]: [tuple(map(ids.__getitem__, prod)) for prod in prods]
+                             for nt, prods in entry["productions"]}
+        grammar.report = ConversionReport.from_dict(entry["report"], grammar)
+        for stage in grammar.report.stages:
+            if "Nullable non-terminals" in stage.details:
+                grammar.N_lambda = set(stage.details["Nullable non-terminals"])
+        return grammar.report
+
+    def _store(self, path, grammar, report):
+        entry = {
+            "symbols": grammar.symbols.names,
+            "non_terminals": sorted(grammar.non_terminals),
+            "terminals": sorted(grammar.terminals),
+            "start_symbol": grammar.start_symbol,
+            # Productions as indexes into symbols; a list of pairs keeps
+            # the production order of the result
+            "productions": [[nt, prods] for nt, prods in grammar.rules.items()],
+            "report": report.to_dict(),
+        }
+
+        # Write to a temporary file and rename so readers never see a
+        # partially written entry
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".json"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+    def clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self._make_directory()
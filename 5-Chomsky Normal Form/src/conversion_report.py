@@ -0,0 +1,105 @@
+def _plain(value):
+    # JSON-friendly copy of the sets and dicts a stage records
+    if isinstance(value, (set, frozenset)):
+        return sorted((_plain(item) for item in value), key=str)
+    if isinstance(value, dict):
+        return {str(key): _plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    return value
+
+
+class StageReport:
+    def __init__(self, name, title, result_message):
+        self.name = name
+        self.title = title
+        self.result_message = result_message
+        self.elapsed = 0.0
+        self.productions_before = 0
+        self.productions_after = 0
+        self.non_terminals_before = 0
+        self.non_terminals_after = 0
+        # Intermediate sets computed by the stage, e.g. nullable symbols
+        self.details = {}
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "title": self.title,
+            "result_message": self.result_message,
+            "elapsed": self.elapsed,
+            "productions_before": self.productions_before,
+            "productions_after": self.productions_after,
+            "non_terminals_before": self.non_terminals_before,
+            "non_terminals_after": self.non_terminals_after,
+            "details": _plain(self.details),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stage = cls(data["name"], data["title"], data["result_message"])
+        stage.elapsed = data["elapsed"]
+        stage.productions_before = data["productions_before"]
+        stage.productions_after = data["productions_after"]
+        stage.non_terminals_before = data["non_terminals_before"]
+        stage.non_terminals_after = data["non_terminals_after"]
+        stage.details = data["details"]
+        return stage
+
+
+class ConversionReport:
+    def __init__(self, grammar):
+        self.grammar = grammar
+        self.stages = []
+        self.elapsed = 0.0
+
+    def stage(self, name):
+        for stage in self.stages:
+            if stage.name == name:
+                return stage
+        raise KeyError(name)
+
+    def to_dict(self):
+        return {
+            "elapsed": self.elapsed,
+            "stages": [stage.to_dict() for stage in self.stages],
+        }
+
+    @classmethod
+    def from_dict(cls, data, grammar):
+        report = cls(grammar)
+        report.elapsed = data["elapsed"]
+        report.stages = [StageReport.from_dict(stage) for stage in data["stages"]]
+        return report
+
+
+class ConversionObserver:
+    # Hook interface for the conversion pipeline; override what you need
+    def conversion_started(self, grammar):
+        pass
+
+    def stage_started(self, stage, grammar):
+        pass
+
+    def stage_finished(self, stage, grammar):
+        pass
+
+    def conversion_finished(self, report, grammar):
+        pass
+
+
+class PrintingObserver(ConversionObserver):
+    # Prints every stage to the console, the way the conversion always has
+    def conversion_started(self, grammar):
+        print("\nConverting grammar to Chomsky Normal Form")
+
+    def stage_started(self, stage, grammar):
+        print(f"\n{stage.title}")
+
+    def stage_finished(self, stage, grammar):
+        for label, value in stage.details.items():
+            print(f"{label}: {value}")
+        grammar.print_grammar(stage.result_message)
+
+    def conversion_finished(self, report, grammar):
+        print("\nConversion to Chomsky Normal Form complete!")
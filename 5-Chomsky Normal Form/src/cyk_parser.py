@@ -0,0 +1,159 @@
+class CYKParser:
+    # CYK recognizer over a grammar already converted to Chomsky Normal
+    # Form. Non-terminals are numbered 0..n-1 and a chart cell is an int
+    # bitset of the non-terminals deriving that span, so combining two
+    # cells only looks at the binary rules whose left symbol is present.
+    MAX_COMBINED = 1 << 16
+
+    def __init__(self, grammar):
+        self.grammar = grammar
+        self.symbols = grammar.symbols
+
+        self.order = sorted(grammar.nt_ids | set(grammar.rules))
+        self.bit = {nt: i for i, nt in enumerate(self.order)}
+        self.start = self.bit.get(grammar.start_id)
+        # CNF has no epsilon productions; the empty word is in the language
+        # when the start symbol was nullable before conversion
+        self.accepts_empty = grammar.start_symbol in grammar.N_lambda
+
+        # terminal id -> bitset of A with A -> terminal
+        self.terminal_rules = {}
+        # (B, C) -> bitset of A with A -> B C, and the same rules indexed
+        # by B for the chart fill and by A for rebuilding trees
+        self.pair_rules = {}
+        self.by_left = {}
+        self.by_head = {}
+
+        for nt, prods in grammar.rules.items():
+            head = self.bit[nt]
+            for prod in prods:
+                if len(prod) == 1 and prod[0] in grammar.terminal_ids:
+                    self.terminal_rules[prod[0]] = self.terminal_rules.get(prod[0], 0) | 1 << head
+                elif len(prod) == 2 and prod[0] in self.bit and prod[1] in self.bit:
+                    pair = (self.bit[prod[0]], self.bit[prod[1]])
+                    self.pair_rules[pair] = self.pair_rules.get(pair, 0) | 1 << head
+                    self.by_head.setdefault(head, []).append(pair)
+                else:
+                    raise ValueError(f"Not in Chomsky Normal Form: {self.symbols.name(nt)} -> "
+                                     f"{self.symbols.decode(prod)}")
+
+        for (left, right), heads in self.pair_rules.items():
+            self.by_left.setdefault(left, []).append((1 << right, heads))
+
+        # (left cell, right cell) -> heads; charts of one grammar reuse a
+        # small number of distinct cells, so most combinations are lookups
+        self.combined = {}
+
+        self.terminal_names = sorted((self.symbols.name(t) for t in grammar.terminal_ids), key=len, reverse=True)
+
+    def encode(self, word):
+        # A word is a string or a sequence of terminal names; strings are
+        # split on the longest terminal name at each position. Returns
+        # None when the word contains something that is not a terminal.
+        if isinstance(word, str):
+            tokens = []
+            i = 0
+            while i < len(word):
+                for name in self.terminal_names:
+                    if word.startswith(name, i):
+                        tokens.append(name)
+                        i += len(name)
+                        break
+                else:
+                    return None
+            word = tokens
+
+        ids = self.symbols.ids
+        encoded = []
+        for name in word:
+            symbol_id = ids.get(name)
+            if symbol_id not in self.grammar.terminal_ids:
+                return None
+            encoded.append(symbol_id)
+        return encoded
+
+    def chart(self, word):
+        tokens = self.encode(word)
+        if not tokens:
+            return None
+        return self._fill(tokens)
+
+    def _fill(self, tokens):
+        # chart[length - 1][start] is the bitset of non-terminals deriving
+        # the span tokens[start:start + length]; rows are the chart's
+        # diagonals, filled from the shortest spans up
+        terminal_rules = self.terminal_rules
+        chart = [[terminal_rules.get(token, 0) for token in tokens]]
+        n = len(tokens)
+        combined = self.combined
+        if len(combined) > self.MAX_COMBINED:
+            combined.clear()
+
+        for length in range(2, n + 1):
+            row = []
+            for start in range(n - length + 1):
+                cell = 0
+                for split in range(1, length):
+                    left = chart[split - 1][start]
+                    right = chart[length - split - 1][start + split]
+                    if left and right:
+                        heads = combined.get((left, right))
+                        if heads is None:
+                            heads = combined[left, right] = self._combine(left, right)
+                        cell |= heads
+                row.append(cell)
+            chart.append(row)
+
+        return chart
+
+    def _combine(self, left, right):
+        heads = 0
+        while left:
+            lowest = left & -left
+            for right_bit, pair_heads in self.by_left.get(lowest.bit_length() - 1, ()):
+                if right & right_bit:
+                    heads |= pair_heads
+            left ^= lowest
+        return heads
+
+    def recognize(self, word):
+        tokens = self.encode(word)
+        if tokens is None:
+            return False
+        if not tokens:
+            return self.accepts_empty
+        if self.start is None:
+            return False
+        return bool(self._fill(tokens)[-1][0] >> self.start & 1)
+
+    def recognize_many(self, words):
+        return [self.recognize(word) for word in words]
+
+    def parse(self, word):
+        # Lazily yields every parse tree of word as nested tuples
+        # (non-terminal, left, right) or (non-terminal, terminal); the
+        # empty word gets the single tree (start symbol, "ε")
+        tokens = self.encode(word)
+        if tokens is not None and not tokens and self.accepts_empty:
+            yield (self.grammar.start_symbol, "ε")
+        if self.start is None or not tokens:
+            return
+        chart = self._fill(tokens)
+        if chart[-1][0] >> self.start & 1:
+            yield from self._trees(chart, tokens, self.start, 0, len(tokens))
+
+    def _trees(self, chart, tokens, head, start, length):
+        name = self.symbols.name(self.order[head])
+        if length == 1:
+            yield (name, self.symbols.name(tokens[start]))
+            return
+
+        for split in range(1, length):
+            left_cell = chart[split - 1][start]
+            right_cell = chart[length - split - 1][start + split]
+            for left, right in self.by_head.get(head, ()):
+                if left_cell >> left & 1 and right_cell >> right & 1:
+                    for left_tree in self._trees(chart, tokens, left, start, split):
+                        for right_tree in self._trees(chart, tokens, right, start + split, length - split):
+                            yield (name, left_tree, right_tree)
+
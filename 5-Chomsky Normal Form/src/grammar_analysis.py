@@ -0,0 +1,184 @@
+from collections import deque
+
+
+class GrammarAnalysis:
+    # Nullable, productive, reachable and unit-pair sets of a grammar given
+    # as {non-terminal id: [production tuples]}; the first three in time
+    # linear in the size of the grammar. Productions are numbered once and every
+    # symbol keeps the list of productions it occurs in, so a symbol that
+    # becomes nullable/productive only touches the productions using it.
+    def __init__(self, rules, terminals, start, non_terminals):
+        self.rules = rules
+        self.terminals = terminals
+        self.start = start
+        self.non_terminals = non_terminals
+
+        # Production numbering, built by the first nullable/productive query
+        self.heads = None
+        self.lengths = None
+        self.occurrences = None
+
+        self._nullable = None
+        self._productive = None
+        self._reachable = None
+        self._unit_pairs = None
+
+    @property
+    def nullable(self):
+        # Non-terminals deriving the empty string
+        if self._nullable is None:
+            self._nullable = self._derivable(())
+        return self._nullable
+
+    @property
+    def productive(self):
+        # Non-terminals deriving some string of terminals
+        if self._productive is None:
+            self._productive = self._derivable(self.terminals)
+        return self._productive
+
+    @property
+    def reachable(self):
+        # Non-terminals reachable from the start symbol
+        if self._reachable is None:
+            reachable = {self.start}
+            queue = deque([self.start])
+            while queue:
+                for prod in self.rules.get(queue.popleft(), ()):
+                    for symbol in prod:
+                        if symbol in self.non_terminals and symbol not in reachable:
+                            reachable.add(symbol)
+                            queue.append(symbol)
+            self._reachable = reachable
+        return self._reachable
+
+    @property
+    def unit_pairs(self):
+        # {A: every B with A =>* B through unit productions}, A included.
+        # Strongly connected components of the unit graph share one
+        # closure; components come out of Tarjan in reverse topological
+        # order, so each closure is its members plus the already computed
+        # closures of its successors, kept as int bitsets.
+        if self._unit_pairs is None:
+            graph = self._unit_graph()
+            order = list(graph)
+            bit = {nt: i for i, nt in enumerate(order)}
+
+            component_of = {}
+            reach = []
+            unit_pairs = {}
+            for component in _strongly_connected_components(graph):
+                c = len(reach)
+                mask = 0
+                for nt in component:
+                    component_of[nt] = c
+                    mask |= 1 << bit[nt]
+                for nt in component:
+                    for successor in graph[nt]:
+                        if component_of[successor] != c:
+                            mask |= reach[component_of[successor]]
+                reach.append(mask)
+
+                closure = set()
+                while mask:
+                    lowest = mask & -mask
+                    closure.add(order[lowest.bit_length() - 1])
+                    mask ^= lowest
+                for nt in component:
+                    unit_pairs[nt] = closure
+
+            self._unit_pairs = unit_pairs
+        return self._unit_pairs
+
+    def _unit_graph(self):
+        graph = {}
+        for nt in self.non_terminals:
+            graph[nt] = [prod[0] for prod in self.rules.get(nt, ())
+                         if len(prod) == 1 and prod[0] in self.non_terminals]
+        return graph
+
+    def _index_productions(self):
+        self.heads = []
+        self.lengths = []
+        self.occurrences = {}
+        for nt, prods in self.rules.items():
+            for prod in prods:
+                index = len(self.heads)
+                self.heads.append(nt)
+                self.lengths.append(len(prod))
+                for symbol in prod:
+                    self.occurrences.setdefault(symbol, []).append(index)
+
+    def _derivable(self, seeds):
+        # Heads of productions whose symbols are all seeds or derivable
+        # heads. counters[i] is the number of symbol occurrences in
+        # production i not yet known to be derivable.
+        if self.heads is None:
+            self._index_productions()
+        counters = list(self.lengths)
+        derivable = set()
+        queue = deque(seeds)
+
+        for index, missing in enumerate(counters):
+            head = self.heads[index]
+            if missing == 0 and head not in derivable:
+                derivable.add(head)
+                queue.append(head)
+
+        occurrences = self.occurrences
+        heads = self.heads
+        while queue:
+            for index in occurrences.get(queue.popleft(), ()):
+                counters[index] -= 1
+                if counters[index] == 0:
+                    head = heads[index]
+                    if head not in derivable:
+                        derivable.add(head)
+                        queue.append(head)
+
+        return derivable
+
+
+def _strongly_connected_components(graph):
+    # Iterative Tarjan; yields each component after every component
+    # reachable from it
+    index = {}
+    low = {}
+    stack = []
+    on_stack = set()
+
+    for root in graph:
+        if root in index:
+            continue
+
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(graph[root]))]
+
+        while work:
+            node, successors = work[-1]
+            for successor in successors:
+                if successor not in index:
+                    index[successor] = low[successor] = len(index)
+                    stack.append(successor)
+                    on_stack.add(successor)
+                    work.append((successor, iter(graph[successor])))
+                    break
+                if successor in on_stack:
+                    low[node] = min(low[node], index[successor])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    yield component
@@ -0,0 +1,371 @@
+from collections import deque
+
+
+class HornClosure:
+    # Least set of facts closed under clauses "head holds if every body
+    # symbol holds", kept up to date while clauses are added and removed.
+    # Nullable, productive and reachable are all of this shape.
+    #
+    # Every fact has a rank one above the body facts of the clause that
+    # derived it. A fact that loses a clause is kept when another satisfied
+    # clause has only lower-ranked body facts, since that support cannot
+    # run back through the fact itself. Otherwise the fact and everything
+    # depending on it is over-deleted the same way and whatever still has
+    # support is re-derived.
+    def __init__(self):
+        self.facts = set()
+        self.rank = {}
+        # (head, body) -> multiplicity, body symbols that are not facts yet
+        self.clauses = {}
+        self.missing = {}
+        # head -> its clauses; symbol -> {clause: occurrences in body}
+        self.by_head = {}
+        self.uses = {}
+        # Facts whose membership flipped since the last take_changes()
+        self.changed = set()
+
+    def add(self, head, body=()):
+        key = (head, body)
+        count = self.clauses.get(key, 0)
+        self.clauses[key] = count + 1
+        if count:
+            return
+
+        missing = 0
+        for symbol in body:
+            uses = self.uses.setdefault(symbol, {})
+            uses[key] = uses.get(key, 0) + 1
+            if symbol not in self.facts:
+                missing += 1
+        self.missing[key] = missing
+        self.by_head.setdefault(head, set()).add(key)
+
+        if missing == 0 and head not in self.facts:
+            self._derive([(head, self._clause_rank(body))])
+
+    def remove(self, head, body=()):
+        key = (head, body)
+        count = self.clauses[key] - 1
+        if count:
+            self.clauses[key] = count
+            return
+
+        satisfied = self.missing[key] == 0
+        del self.clauses[key]
+        del self.missing[key]
+        self.by_head[head].discard(key)
+        for symbol in set(body):
+            uses = self.uses[symbol]
+            del uses[key]
+            if not uses:
+                del self.uses[symbol]
+
+        if satisfied and head in self.facts and not self._justified(head):
+            self._retract(head)
+
+    def take_changes(self):
+        changed = self.changed
+        self.changed = set()
+        return changed
+
+    def _flip(self, fact):
+        if fact in self.changed:
+            self.changed.discard(fact)
+        else:
+            self.changed.add(fact)
+
+    def _clause_rank(self, body):
+        return 1 + max((self.rank[symbol] for symbol in body), default=-1)
+
+    def _justified(self, head):
+        rank = self.rank[head]
+        for key in self.by_head.get(head, ()):
+            if self.missing[key] == 0 and all(self.rank[symbol] < rank for symbol in key[1]):
+                return True
+        return False
+
+    def _derive(self, queue):
+        # queue holds (fact, rank) pairs of facts whose clause is satisfied
+        queue = deque(queue)
+        while queue:
+            fact, rank = queue.popleft()
+            if fact in self.facts:
+                continue
+            self.facts.add(fact)
+            self.rank[fact] = rank
+            self._flip(fact)
+            for key, occurrences in self.uses.get(fact, {}).items():
+                self.missing[key] -= occurrences
+                if self.missing[key] == 0 and key[0] not in self.facts:
+                    queue.append((key[0], self._clause_rank(key[1])))
+
+    def _retract(self, fact):
+        self.facts.discard(fact)
+        self._flip(fact)
+        deleted = [fact]
+        queue = deque(deleted)
+        while queue:
+            for key, occurrences in self.uses.get(queue.popleft(), {}).items():
+                satisfied = self.missing[key] == 0
+                self.missing[key] += occurrences
+                head = key[0]
+                if satisfied and head in self.facts and not self._justified(head):
+                    self.facts.discard(head)
+                    self._flip(head)
+                    deleted.append(head)
+                    queue.append(head)
+
+        # Re-derive over-deleted facts that still have a satisfied clause
+        seeds = []
+        for fact in deleted:
+            ranks = [self._clause_rank(key[1]) for key in self.by_head.get(fact, ()) if self.missing[key] == 0]
+            if ranks and fact not in self.facts:
+                seeds.append((fact, min(ranks)))
+        self._derive(seeds)
+
+
+class IncrementalConversion:
+    # Chomsky Normal Form of grammar's source productions, maintained under
+    # added and removed source productions. Every stage keeps its output
+    # as counts per (head, production), so a change only touches the
+    # productions it affects:
+    #   BIN      binary: productions from Grammar._binarize of each source production
+    #   DEL      deleted: Grammar._variants of each binary production
+    #   UNIT     unit_free: non-unit productions of every B in closure(A)
+    #   reachable/productive facts decide which unit-free productions
+    #   survive, and TERM rewrites those into output.
+    # The result has the same non-terminals and the same productions per
+    # non-terminal as Grammar.convert_to_chomsky_normal_form.
+    def __init__(self, grammar, source_rules, non_terminals):
+        self.grammar = grammar
+        self.non_terminals = set(non_terminals)
+        self.terminals = set(grammar.terminal_ids)
+        self.start = grammar.start_id
+        self.generated = set()
+
+        self.source = {}
+        self.binary = {}
+        self.binary_uses = {}
+        self.nullable = HornClosure()
+        self.variants = {}
+        self.deleted = {}
+        self.deleted_by_head = {}
+        self.unit_graph = {}
+        self.closure = {}
+        self.closed_by = {}
+        self.unit_free = {}
+        self.unit_free_by_head = {}
+        self.unit_free_uses = {}
+
+        self.reachable = HornClosure()
+        self.reachable.add(self.start)
+        self.productive = HornClosure()
+        for terminal in self.terminals:
+            self.productive.add(terminal)
+
+        self.terminal_non_terminals = {terminal: grammar._terminal_symbol(terminal)
+                                       for terminal in sorted(self.terminals)}
+        self.surviving = set()
+        self.output = {}
+        self.output_non_terminals = set()
+        for terminal, nt in self.terminal_non_terminals.items():
+            self.output[nt] = {(terminal,): 1}
+            self.output_non_terminals.add(nt)
+
+        added = [(nt, prod) for nt, prods in source_rules.items() for prod in prods]
+        self.apply(added, [])
+
+    def is_non_terminal(self, symbol):
+        return symbol in self.non_terminals or symbol in self.generated
+
+    def apply(self, added, removed):
+        # added/removed are lists of source (head, production) pairs.
+        # Returns the heads whose output productions changed.
+        binary_changes = self._update_source(added, removed)
+        deleted_changes = self._update_deleted(binary_changes)
+        unit_free_changes = self._update_unit_free(deleted_changes)
+        return self._update_output(unit_free_changes)
+
+    @staticmethod
+    def _count(counts, key, delta):
+        # Adjusts a multiset count; True when key entered or left the set
+        old = counts.get(key, 0)
+        new = old + delta
+        if new:
+            counts[key] = new
+        else:
+            del counts[key]
+        return (old == 0) != (new == 0)
+
+    def _update_source(self, added, removed):
+        changes = {}
+        for pairs, delta in ((removed, -1), (added, 1)):
+            for nt, prod in pairs:
+                if not self._count(self.source, (nt, prod), delta):
+                    continue
+                for head, binary in self.grammar._binarize(nt, prod):
+                    if head != nt:
+                        self.generated.add(head)
+                    key = (head, binary)
+                    if self._count(self.binary, key, delta):
+                        changes[key] = changes.get(key, 0) + delta
+
+        changes = [key for key, delta in changes.items() if delta]
+        for key in changes:
+            head, binary = key
+            if key in self.binary:
+                self.nullable.add(head, binary)
+                for symbol in binary:
+                    self.binary_uses.setdefault(symbol, set()).add(key)
+            else:
+                self.nullable.remove(head, binary)
+                for symbol in binary:
+                    self.binary_uses[symbol].discard(key)
+        return changes
+
+    def _update_deleted(self, binary_changes):
+        # Binary productions to re-expand: the changed ones and those
+        # using a symbol whose nullability flipped
+        affected = set(binary_changes)
+        for symbol in self.nullable.take_changes():
+            affected.update(self.binary_uses.get(symbol, ()))
+
+        changes = {}
+        nullable = self.nullable.facts
+        for key in affected:
+            head = key[0]
+            old = self.variants.pop(key, ())
+            new = self.grammar._variants(key[1], nullable) if key in self.binary else []
+            if new:
+                self.variants[key] = new
+            for variants, delta in ((old, -1), (new, 1)):
+                for variant in variants:
+                    if self._count(self.deleted, (head, variant), delta):
+                        changes[head, variant] = changes.get((head, variant), 0) + delta
+
+        return [key for key, delta in changes.items() if delta]
+
+    def _is_unit(self, prod):
+        return len(prod) == 1 and self.is_non_terminal(prod[0])
+
+    def _closure_of(self, nt):
+        if nt not in self.closure:
+            self.closure[nt] = {nt}
+            self.closed_by.setdefault(nt, set()).add(nt)
+        return self.closure[nt]
+
+    def _update_unit_free(self, deleted_changes):
+        changes = {}
+
+        def count(key, delta):
+            if self._count(self.unit_free, key, delta):
+                changes[key] = changes.get(key, 0) + delta
+
+        # New DEL output against the old closures
+        changed_edges = set()
+        for head, prod in deleted_changes:
+            self._closure_of(head)
+            present = (head, prod) in self.deleted
+            if self._is_unit(prod):
+                self._closure_of(prod[0])
+                targets = self.unit_graph.setdefault(head, set())
+                if present:
+                    targets.add(prod[0])
+                else:
+                    targets.discard(prod[0])
+                changed_edges.add(head)
+                continue
+
+            prods = self.deleted_by_head.setdefault(head, set())
+            if present:
+                prods.add(prod)
+            else:
+                prods.discard(prod)
+            for source in self.closed_by[head]:
+                count((source, prod), 1 if present else -1)
+
+        # Then the closures of every non-terminal that reaches a changed
+        # unit edge, against the new DEL output
+        affected = set()
+        for head in changed_edges:
+            affected.update(self.closed_by[head])
+        for source in affected:
+            old = self.closure[source]
+            new = {source}
+            queue = deque([source])
+            while queue:
+                for target in self.unit_graph.get(queue.popleft(), ()):
+                    if target not in new:
+                        new.add(target)
+                        queue.append(target)
+            self.closure[source] = new
+
+            for targets, delta in ((new - old, 1), (old - new, -1)):
+                for target in targets:
+                    if delta > 0:
+                        self.closed_by.setdefault(target, set()).add(source)
+                    else:
+                        self.closed_by[target].discard(source)
+                    for prod in self.deleted_by_head.get(target, ()):
+                        count((source, prod), delta)
+
+        changes = [key for key, delta in changes.items() if delta]
+        for key in changes:
+            head, prod = key
+            present = key in self.unit_free
+            if present:
+                self.unit_free_by_head.setdefault(head, set()).add(prod)
+                self.productive.add(head, prod)
+            else:
+                self.unit_free_by_head[head].discard(prod)
+                self.productive.remove(head, prod)
+            for symbol in prod:
+                if present:
+                    self.unit_free_uses.setdefault(symbol, set()).add(key)
+                else:
+                    self.unit_free_uses[symbol].discard(key)
+                if self.is_non_terminal(symbol):
+                    if present:
+                        self.reachable.add(symbol, (head,))
+                    else:
+                        self.reachable.remove(symbol, (head,))
+        return changes
+
+    def _survives(self, head, prod):
+        # Accessible, productive and not using a non-productive symbol
+        productive = self.productive.facts
+        return ((head, prod) in self.unit_free and head in self.reachable.facts and head in productive
+                and all(symbol in productive for symbol in prod if self.is_non_terminal(symbol)))
+
+    def _update_output(self, unit_free_changes):
+        flipped = self.reachable.take_changes() | self.productive.take_changes()
+
+        affected = set(unit_free_changes)
+        for symbol in flipped:
+            affected.update((symbol, prod) for prod in self.unit_free_by_head.get(symbol, ()))
+            affected.update(self.unit_free_uses.get(symbol, ()))
+            if self.is_non_terminal(symbol):
+                if symbol in self.reachable.facts and symbol in self.productive.facts:
+                    self.output_non_terminals.add(symbol)
+                else:
+                    self.output_non_terminals.discard(symbol)
+
+        changed_heads = set()
+        for key in affected:
+            survives = self._survives(*key)
+            if survives == (key in self.surviving):
+                continue
+            head, prod = key
+            replaced = self.grammar._replace_terminals(prod, self.terminal_non_terminals)
+            prods = self.output.setdefault(head, {})
+            if survives:
+                self.surviving.add(key)
+                prods[replaced] = prods.get(replaced, 0) + 1
+            else:
+                self.surviving.discard(key)
+                self._count(prods, replaced, -1)
+                if not prods:
+                    del self.output[head]
+            changed_heads.add(head)
+
+        return changed_heads
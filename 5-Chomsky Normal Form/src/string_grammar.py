@@ -0,0 +1,305 @@
+import time
+from contextlib import contextmanager
+from itertools import chain, combinations
+
+from conversion_report import ConversionReport, PrintingObserver, StageReport
+
+# Grammar.py as it was before symbols were interned: productions are plain
+# strings and every character is one symbol. Kept only as the baseline that
+# benchmark_cnf.py compares the interned stages against.
+class StringGrammar:
+    def __init__(self, non_terminals, terminals, productions, start_symbol, quiet=False, observers=None):
+        self.non_terminals = non_terminals
+        self.terminals = terminals
+        self.productions = productions
+        self.start_symbol = start_symbol
+        self.N_lambda = set()
+        # quiet drops the console printer; observers receive stage reports
+        self.observers = list(observers or [])
+        if not quiet:
+            self.observers.insert(0, PrintingObserver())
+        self.report = ConversionReport(self)
+
+    def print_grammar(self, message="Current grammar:"):
+        print(f"\n{message}")
+        print(f"Non-terminals: {self.non_terminals}")
+        print(f"Terminals: {self.terminals}")
+        print(f"Start symbol: {self.start_symbol}")
+        print("Productions:")
+        for nt, prods in self.productions.items():
+            print(f"  {nt} -> {' | '.join(prods)}")
+        print()
+
+    def _production_count(self):
+        return sum(len(prods) for prods in self.productions.values())
+
+    def _notify(self, event, *args):
+        for observer in self.observers:
+            getattr(observer, event)(*args, self)
+
+    @contextmanager
+    def _stage(self, name, title, result_message):
+        stage = StageReport(name, title, result_message)
+        stage.productions_before = self._production_count()
+        stage.non_terminals_before = len(self.non_terminals)
+        self._notify("stage_started", stage)
+
+        start = time.perf_counter()
+        yield stage
+        stage.elapsed = time.perf_counter() - start
+
+        stage.productions_after = self._production_count()
+        stage.non_terminals_after = len(self.non_terminals)
+        self.report.stages.append(stage)
+        self._notify("stage_finished", stage)
+
+    def eliminate_empty_productions(self):
+        with self._stage("eliminate_empty_productions", "Step 1: Eliminating epsilon productions",
+                         "Grammar after eliminating epsilon productions:") as stage:
+            self._eliminate_empty_productions(stage)
+        return self
+
+    def _eliminate_empty_productions(self, stage):
+        N_lambda = set()
+        
+        for nt, prods in self.productions.items():
+            if "ε" in prods or "epsilon" in prods:
+                N_lambda.add(nt)
+        
+        changed = True
+        while changed:
+            changed = False
+            for nt, prods in self.productions.items():
+                if nt in N_lambda:
+                    continue
+                
+                for prod in prods:
+                    if all(symbol in N_lambda for symbol in prod):
+                        N_lambda.add(nt)
+                        changed = True
+                        break
+        
+        self.N_lambda = N_lambda
+        stage.details["Nullable non-terminals"] = N_lambda
+        
+        new_productions = {nt: [] for nt in self.productions}
+        
+        for nt, prods in self.productions.items():
+            for prod in prods:
+                if prod == "ε" or prod == "epsilon":
+                    continue
+                
+                nullable_positions = []
+                for i, symbol in enumerate(prod):
+                    if symbol in N_lambda:
+                        nullable_positions.append(i)
+                
+                all_subsets = chain.from_iterable(
+                    combinations(nullable_positions, r) 
+                    for r in range(len(nullable_positions) + 1)
+                )
+                
+                for subset in all_subsets:
+                    new_prod = "".join(symbol for i, symbol in enumerate(prod) if i not in subset)
+                    
+                    if new_prod and new_prod not in new_productions[nt]:
+                        new_productions[nt].append(new_prod)
+        
+        self.productions = new_productions
+        
+        self.productions = {nt: prods for nt, prods in self.productions.items() if prods}
+
+    def eliminate_unit_productions(self):
+        with self._stage("eliminate_unit_productions", "Step 2: Eliminating unit productions (renaming)",
+                         "Grammar after eliminating unit productions:") as stage:
+            self._eliminate_unit_productions(stage)
+        return self
+
+    def _eliminate_unit_productions(self, stage):
+        unit_pairs = {nt: {nt} for nt in self.non_terminals}
+        
+        changed = True
+        while changed:
+            changed = False
+            for A in self.non_terminals:
+                for prod in self.productions.get(A, []):
+                    if prod in self.non_terminals:
+                        B = prod
+                        for C in unit_pairs.get(B, set()):
+                            if C not in unit_pairs[A]:
+                                unit_pairs[A].add(C)
+                                changed = True
+        
+        stage.details["Unit pairs"] = unit_pairs
+        
+        new_productions = {nt: [] for nt in self.non_terminals}
+        
+        for A in self.non_terminals:
+            for B in unit_pairs[A]:
+                for prod in self.productions.get(B, []):
+                    if prod not in self.non_terminals and prod not in new_productions[A]:
+                        new_productions[A].append(prod)
+        
+        self.productions = new_productions
+        
+        self.productions = {nt: prods for nt, prods in self.productions.items() if prods}
+
+    def eliminate_inaccessible_symbols(self):
+        with self._stage("eliminate_inaccessible_symbols", "Step 3: Eliminating inaccessible symbols",
+                         "Grammar after eliminating inaccessible symbols:") as stage:
+            self._eliminate_inaccessible_symbols(stage)
+        return self
+
+    def _eliminate_inaccessible_symbols(self, stage):
+        accessible = {self.start_symbol}
+        queue = [self.start_symbol]
+        
+        while queue:
+            current = queue.pop(0)
+            for prod in self.productions.get(current, []):
+                for symbol in prod:
+                    if symbol in self.non_terminals and symbol not in accessible:
+                        accessible.add(symbol)
+                        queue.append(symbol)
+        
+        stage.details["Accessible non-terminals"] = accessible
+        
+        inaccessible = self.non_terminals - accessible
+        stage.details["Inaccessible non-terminals being removed"] = inaccessible
+        
+        self.non_terminals = accessible
+        self.productions = {nt: prods for nt, prods in self.productions.items() if nt in accessible}
+
+    def eliminate_non_productive_symbols(self):
+        with self._stage("eliminate_non_productive_symbols", "Step 4: Eliminating non-productive symbols",
+                         "Grammar after eliminating non-productive symbols:") as stage:
+            self._eliminate_non_productive_symbols(stage)
+        return self
+
+    def _eliminate_non_productive_symbols(self, stage):
+        productive = set()
+        
+        for nt, prods in self.productions.items():
+            for prod in prods:
+                if all(symbol in self.terminals for symbol in prod):
+                    productive.add(nt)
+                    break
+        
+        changed = True
+        while changed:
+            changed = False
+            for nt, prods in self.productions.items():
+                if nt in productive:
+                    continue
+                
+                for prod in prods:
+                    if all(symbol in self.terminals or symbol in productive for symbol in prod):
+                        productive.add(nt)
+                        changed = True
+                        break
+        
+        stage.details["Productive non-terminals"] = productive
+        
+        non_productive = self.non_terminals - productive
+        stage.details["Non-productive non-terminals being removed"] = non_productive
+        
+        self.non_terminals = productive
+        
+        new_productions = {}
+        for nt in productive:
+            new_productions[nt] = []
+            for prod in self.productions.get(nt, []):
+                if all(symbol not in self.non_terminals or symbol in productive for symbol in prod):
+                    new_productions[nt].append(prod)
+        
+        self.productions = new_productions
+        
+        self.productions = {nt: prods for nt, prods in self.productions.items() if prods}
+
+    def convert_to_binary_form(self):
+        with self._stage("convert_to_binary_form", "Converting productions to binary form",
+                         "Grammar after converting to binary form:") as stage:
+            self._convert_to_binary_form(stage)
+        return self
+
+    def _convert_to_binary_form(self, stage):
+        new_productions = {}
+        new_non_terminals = set(self.non_terminals)
+        next_nt_index = 1
+        
+        for nt, prods in self.productions.items():
+            new_productions[nt] = []
+            
+            for prod in prods:
+                if len(prod) <= 2:
+                    new_productions[nt].append(prod)
+                else:
+                    symbols = list(prod)
+                    current_nt = nt
+                    
+                    while len(symbols) > 2:
+                        first = symbols.pop(0)
+                        
+                        new_nt = f"X{next_nt_index}"
+                        next_nt_index += 1
+                        new_non_terminals.add(new_nt)
+                        
+                        new_productions[current_nt] = new_productions.get(current_nt, []) + [first + new_nt]
+                        current_nt = new_nt
+                    
+                    new_productions[current_nt] = new_productions.get(current_nt, []) + ["".join(symbols)]
+        
+        self.non_terminals = new_non_terminals
+        self.productions = new_productions
+
+    def convert_terminal_mixed_productions(self):
+        with self._stage("convert_terminal_mixed_productions", "Converting terminal-mixed productions",
+                         "Grammar after converting terminal-mixed productions:") as stage:
+            self._convert_terminal_mixed_productions(stage)
+        return self
+
+    def _convert_terminal_mixed_productions(self, stage):
+        new_productions = {}
+        new_non_terminals = set(self.non_terminals)
+        terminal_non_terminals = {}
+        
+        for terminal in self.terminals:
+            new_nt = f"T_{terminal}"
+            terminal_non_terminals[terminal] = new_nt
+            new_non_terminals.add(new_nt)
+            new_productions[new_nt] = [terminal]
+        
+        for nt, prods in self.productions.items():
+            new_productions[nt] = new_productions.get(nt, [])
+            
+            for prod in prods:
+                if len(prod) == 1:
+                    new_productions[nt].append(prod)
+                else:
+                    new_prod = ""
+                    for symbol in prod:
+                        if symbol in self.terminals:
+                            new_prod += terminal_non_terminals[symbol]
+                        else:
+                            new_prod += symbol
+                    new_productions[nt].append(new_prod)
+        
+        self.non_terminals = new_non_terminals
+        self.productions = new_productions
+
+    def convert_to_chomsky_normal_form(self):
+        # Returns a ConversionReport; the converted grammar is self
+        self.report = ConversionReport(self)
+        self._notify("conversion_started")
+
+        start = time.perf_counter()
+        self.eliminate_empty_productions()
+        self.eliminate_unit_productions()
+        self.eliminate_inaccessible_symbols()
+        self.eliminate_non_productive_symbols()
+        self.convert_to_binary_form()
+        self.convert_terminal_mixed_productions()
+        self.report.elapsed = time.perf_counter() - start
+
+        self._notify("conversion_finished", self.report)
+        return self.report
@@ -0,0 +1,47 @@
+EPSILON_NAMES = ("ε", "epsilon")
+
+
+class SymbolTable:
+    # Interns symbol names to small integer ids. Productions are stored as
+    # tuples of ids, so multi-character symbols such as T_a are a
+    # single symbol and comparisons/hashing work on ints.
+    def __init__(self):
+        self.ids = {}
+        self.names = []
+        self.max_length = 1
+
+    def intern(self, name):
+        symbol_id = self.ids.get(name)
+        if symbol_id is None:
+            symbol_id = len(self.names)
+            self.ids[name] = symbol_id
+            self.names.append(name)
+            self.max_length = max(self.max_length, len(name))
+        return symbol_id
+
+    def name(self, symbol_id):
+        return self.names[symbol_id]
+
+    def encode(self, text):
+        # Splits a production string on the longest known symbol name at
+        # each position; unknown characters become one-character symbols
+        if text in EPSILON_NAMES:
+            return ()
+        production = []
+        i = 0
+        while i < len(text):
+            for length in range(min(self.max_length, len(text) - i), 0, -1):
+                symbol_id = self.ids.get(text[i:i + length])
+                if symbol_id is not None:
+                    break
+            else:
+                length = 1
+                symbol_id = self.intern(text[i])
+            production.append(symbol_id)
+            i += length
+        return tuple(production)
+
+    def decode(self, production):
+        if not production:
+            return EPSILON_NAMES[0]
+        return "".join(self.names[symbol_id] for symbol_id in production)
@@ -0,0 +1,117 @@
+import itertools
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from Grammar import Grammar
+from cyk_parser import CYKParser
+
+TERMINALS = ['a', 'b']
+
+
+def random_productions(rng):
+    non_terminals = ['S', 'A', 'B', 'C'][:rng.randint(1, 4)]
+    symbols = non_terminals + TERMINALS
+    return {nt: ["".join(rng.choice(symbols) for _ in range(rng.choice([0, 1, 1, 2, 2, 3]))) or "ε"
+                 for _ in range(rng.randint(1, 4))]
+            for nt in non_terminals}
+
+
+def derives(productions, word):
+    # Brute-force check on the source grammar: the least set of
+    # (symbol, start, end) with symbol =>* word[start:end], grown until
+    # nothing changes, matching every production against every span
+    n = len(word)
+    derived = {(t, i, i + 1) for i, t in enumerate(word)}
+
+    def matches(prod, start, end):
+        if not prod:
+            return start == end
+        return any((prod[0], start, split) in derived and matches(prod[1:], split, end)
+                   for split in range(start, end + 1))
+
+    changed = True
+    while changed:
+        changed = False
+        for nt, prods in productions.items():
+            for start in range(n + 1):
+                for end in range(start, n + 1):
+                    if (nt, start, end) in derived:
+                        continue
+                    if any(matches("" if prod == "ε" else prod, start, end) for prod in prods):
+                        derived.add((nt, start, end))
+                        changed = True
+    return ('S', 0, n) in derived
+
+
+def tree_yield(tree):
+    if isinstance(tree[1], str):
+        return [] if tree[1] == "ε" else [tree[1]]
+    return tree_yield(tree[1]) + tree_yield(tree[2])
+
+
+class TestCYKParser(unittest.TestCase):
+    def check_tree(self, grammar, tree):
+        productions = grammar.productions
+        if isinstance(tree[1], str):
+            self.assertIn(tree[1], productions[tree[0]])
+        else:
+            self.assertIn(tree[1][0] + tree[2][0], productions[tree[0]])
+            self.check_tree(grammar, tree[1])
+            self.check_tree(grammar, tree[2])
+
+    def test_matches_brute_force_derivation(self):
+        for seed in range(120):
+            rng = random.Random(seed)
+            productions = random_productions(rng)
+            grammar = Grammar(set(productions), set(TERMINALS), productions, 'S', quiet=True)
+            grammar.convert_to_chomsky_normal_form()
+            parser = CYKParser(grammar)
+
+            for length in range(5):
+                for letters in itertools.product(TERMINALS, repeat=length):
+                    word = "".join(letters)
+                    expected = derives(productions, word)
+                    self.assertEqual(parser.recognize(word), expected, (seed, productions, word))
+
+                    trees = list(itertools.islice(parser.parse(word), 20))
+                    self.assertEqual(bool(trees), expected, (seed, word))
+                    for tree in trees:
+                        self.assertEqual(tree_yield(tree), list(letters))
+                        if word:
+                            self.check_tree(grammar, tree)
+
+    def test_empty_word(self):
+        nullable = Grammar({'S', 'A'}, {'a'}, {'S': ['AA', 'a'], 'A': ['a', 'ε']}, 'S', quiet=True)
+        nullable.convert_to_chomsky_normal_form()
+        parser = CYKParser(nullable)
+        self.assertTrue(parser.recognize(""))
+        self.assertTrue(parser.recognize([]))
+        self.assertEqual(list(parser.parse("")), [('S', "ε")])
+
+        strict = Grammar({'S'}, {'a'}, {'S': ['aS', 'a']}, 'S', quiet=True)
+        strict.convert_to_chomsky_normal_form()
+        parser = CYKParser(strict)
+        self.assertFalse(parser.recognize(""))
+        self.assertEqual(list(parser.parse("")), [])
+
+    def test_only_empty_word(self):
+        grammar = Grammar({'S'}, {'a'}, {'S': ['ε']}, 'S', quiet=True)
+        grammar.convert_to_chomsky_normal_form()
+        parser = CYKParser(grammar)
+        self.assertTrue(parser.recognize(""))
+        self.assertFalse(parser.recognize("a"))
+
+    def test_unknown_symbols_are_rejected(self):
+        grammar = Grammar({'S'}, {'a'}, {'S': ['aS', 'a']}, 'S', quiet=True)
+        grammar.convert_to_chomsky_normal_form()
+        parser = CYKParser(grammar)
+        self.assertFalse(parser.recognize("ab"))
+        self.assertEqual(parser.recognize_many(["a", "aa", "b"]), [True, True, False])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from Grammar import Grammar
+from conversion_cache import ConversionCache
+
+
+def make_grammar():
+    return Grammar({'S', 'A', 'B'}, {'a', 'b'},
+                   {'S': ['AB', 'aSb'], 'A': ['a', 'ε'], 'B': ['bA', 'S']}, 'S', quiet=True)
+
+
+class TestConversionCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = ConversionCache(self.directory)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_hit_matches_conversion(self):
+        self.cache.convert(make_grammar())
+        cached = make_grammar()
+        self.cache.convert(cached)
+        converted = make_grammar()
+        converted.convert_to_chomsky_normal_form()
+
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(cached.productions, converted.productions)
+
+    def test_apply_delta_after_hit(self):
+        self.cache.convert(make_grammar())
+        cached = make_grammar()
+        self.cache.convert(cached)
+        self.assertEqual(self.cache.hits, 1)
+
+        delta = {'added': {'A': ['bb']}, 'removed': {'S': ['aSb']}}
+        cached.apply_delta(**delta)
+
+        expected = Grammar({'S', 'A', 'B'}, {'a', 'b'},
+                           {'S': ['AB'], 'A': ['a', 'ε', 'bb'], 'B': ['bA', 'S']}, 'S', quiet=True)
+        expected.convert_to_chomsky_normal_form()
+        self.assertEqual(cached.non_terminals, expected.non_terminals)
+        self.assertEqual({nt: set(prods) for nt, prods in cached.productions.items()},
+                         {nt: set(prods) for nt, prods in expected.productions.items()})
+
+    def test_keeps_directories_it_did_not_create(self):
+        foreign = os.path.join(self.directory, 'user_photos_2025')
+        os.makedirs(foreign)
+        unmarked = os.path.join(self.directory, '0123456789abcdef')
+        os.makedirs(unmarked)
+        ConversionCache(self.directory)
+
+        self.assertTrue(os.path.isdir(foreign))
+        self.assertTrue(os.path.isdir(unmarked))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from Grammar import Grammar
+
+NON_TERMINALS = ['S', 'A', 'B', 'C', 'D']
+TERMINALS = ['a', 'b']
+
+
+def random_production(rng, symbols):
+    return "".join(rng.choice(symbols) for _ in range(rng.choice([0, 1, 1, 2, 3, 4]))) or "ε"
+
+
+def random_grammar(rng):
+    non_terminals = NON_TERMINALS[:rng.randint(2, len(NON_TERMINALS))]
+    symbols = non_terminals + TERMINALS
+    productions = {nt: [random_production(rng, symbols) for _ in range(rng.randint(1, 4))]
+                   for nt in non_terminals}
+    return Grammar(set(non_terminals), set(TERMINALS), productions, 'S', quiet=True)
+
+
+def converted(grammar):
+    # Full conversion of grammar's current source productions
+    source = {grammar.symbols.name(nt): [grammar.symbols.decode(prod) for prod in prods]
+              for nt, prods in grammar.source_rules.items()}
+    non_terminals = {grammar.symbols.name(nt) for nt in grammar.source_non_terminals}
+    fresh = Grammar(non_terminals, set(TERMINALS), source, 'S', quiet=True)
+    fresh.convert_to_chomsky_normal_form()
+    return fresh
+
+
+def snapshot(grammar):
+    return (set(grammar.non_terminals), grammar.N_lambda,
+            {nt: sorted(prods) for nt, prods in grammar.productions.items()})
+
+
+class TestIncrementalConversion(unittest.TestCase):
+    def test_random_deltas_match_full_conversion(self):
+        for seed in range(150):
+            rng = random.Random(seed)
+            grammar = random_grammar(rng)
+            grammar.convert_to_chomsky_normal_form()
+
+            for step in range(8):
+                added, removed = {}, {}
+                for _ in range(rng.randint(1, 3)):
+                    source = [(grammar.symbols.name(nt), grammar.symbols.decode(prod))
+                              for nt, prods in grammar.source_rules.items() for prod in prods]
+                    if source and rng.random() < 0.5:
+                        nt, prod = rng.choice(source)
+                        if removed.get(nt, []).count(prod) < source.count((nt, prod)):
+                            removed.setdefault(nt, []).append(prod)
+                    else:
+                        # Mostly existing heads; sometimes one new to the grammar
+                        nt = rng.choice(NON_TERMINALS) if rng.random() < 0.9 else f"M{rng.randrange(2)}"
+                        added.setdefault(nt, []).append(random_production(rng, NON_TERMINALS + TERMINALS))
+
+                grammar.apply_delta(added, removed)
+                self.assertEqual(snapshot(grammar), snapshot(converted(grammar)), (seed, step, added, removed))
+
+    def test_removing_missing_production_raises(self):
+        grammar = Grammar({'S'}, {'a'}, {'S': ['a']}, 'S', quiet=True)
+        grammar.convert_to_chomsky_normal_form()
+        with self.assertRaises(ValueError):
+            grammar.apply_delta(removed={'S': ['aa']})
+
+    def test_apply_delta_needs_conversion(self):
+        grammar = Grammar({'S'}, {'a'}, {'S': ['a']}, 'S', quiet=True)
+        with self.assertRaises(ValueError):
+            grammar.apply_delta(added={'S': ['aa']})
+
+
+if __name__ == '__main__':
+    unittest.main()
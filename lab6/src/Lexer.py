@@ -1,57 +1,145 @@
 import re
 
 from Token import Token
+from TokenBuffer import TOKEN_TYPES, TokenBuffer
 from TokenType import TokenType
 
 
+TOKEN_PATTERNS = [
+    (TokenType.PROCESS, r'PROCESS'),
+    (TokenType.TITLE, r'TITLE'),
+    (TokenType.COMPONENT, r'COMPONENT'),
+    (TokenType.STEP, r'STEP'),
+    (TokenType.YIELD, r'YIELD'),
+    (TokenType.TIME, r'TIME'),
+    (TokenType.TEMP, r'TEMP'),
+    (TokenType.STRING, r'"[^"]*"'),
+    (TokenType.NUMBER, r'[0-9]+(\.[0-9]+)?'),
+    (TokenType.UNIT, r'(g|ml|tsp|tbsp|cup)'),
+    (TokenType.TIME_UNIT, r'(min|hr|days)'),
+    (TokenType.TEMP_UNIT, r'(C|F)'),
+    (TokenType.ID, r'[a-zA-Z][a-zA-Z0-9_]*'),  # Put this last
+    (TokenType.COLON, r':'),
+    (TokenType.SEMICOLON, r';'),
+    (TokenType.COMMA, r','),
+    (TokenType.LBRACE, r'{'),
+    (TokenType.RBRACE, r'}'),
+    (None, r'[ \t\n]+')  # Whitespace is ignored
+]
+
+
+def _build_master_regex(token_patterns):
+    # One alternation of named groups; the regex engine tries the branches
+    # left to right, so the first pattern that matches still wins.
+    group_types = {}
+    branches = []
+
+    for token_type, pattern in token_patterns:
+        name = token_type.name if token_type is not None else 'WHITESPACE'
+        group_types[name] = token_type
+        branches.append(f'(?P<{name}>{pattern})')
+
+    return re.compile('|'.join(branches), re.IGNORECASE), group_types
+
+
+MASTER_REGEX, GROUP_TYPES = _build_master_regex(TOKEN_PATTERNS)
+GROUP_CODES = {name: token_type.value if token_type is not None else None
+               for name, token_type in GROUP_TYPES.items()}
+
+# Characters iter_tokens keeps past a match before accepting it: a pattern
+# cut off by the end of a chunk can let a shorter one win instead ("C" of
+# "COMPONENT" as TEMP_UNIT, "1" of "1.5"), so this must cover the longest
+# keyword. Unterminated strings match nothing and always read on.
+LOOKAHEAD = 16
+
+
 class Lexer:
     def __init__(self):
         self.tokens = []
-        self.token_patterns = [
-            (TokenType.PROCESS, r'PROCESS'),
-            (TokenType.TITLE, r'TITLE'),
-            (TokenType.COMPONENT, r'COMPONENT'),
-            (TokenType.STEP, r'STEP'),
-            (TokenType.YIELD, r'YIELD'),
-            (TokenType.TIME, r'TIME'),
-            (TokenType.TEMP, r'TEMP'),
-            (TokenType.STRING, r'"[^"]*"'),
-            (TokenType.NUMBER, r'[0-9]+(\.[0-9]+)?'),
-            (TokenType.UNIT, r'(g|ml|tsp|tbsp|cup)'),
-             (TokenType.TIME_UNIT, r'(min|hr|days)'),
-            (TokenType.TEMP_UNIT, r'(C|F)'),
-            (TokenType.ID, r'[a-zA-Z][a-zA-Z0-9_]*'),  # Put this last
-            (TokenType.COLON, r':'),
-            (TokenType.SEMICOLON, r';'),
-            (TokenType.COMMA, r','),
-            (TokenType.LBRACE, r'{'),
-            (TokenType.RBRACE, r'}'),
-            (None, r'[ \t\n]+')  # Whitespace is ignored
-        ]
+        self.token_patterns = TOKEN_PATTERNS
 
     def tokenize(self, text):
-        self.tokens = []
+        self.tokens = list(self.iter_tokens(text))
+        return self.tokens
+
+    def tokenize_buffer(self, text):
+        # Same tokens as tokenize, kept as integer codes and offsets in a
+        # TokenBuffer instead of a list of Token objects
+        buffer = TokenBuffer(text)
+        append = buffer.append
+
+        for code, m, offset in self._scan(text):
+            append(code, offset + m.start(), offset + m.end())
+
+        buffer.append(TokenType.EOF.value, len(text), len(text))
+        return buffer
+
+    def iter_tokens(self, source, chunk_size=1 << 16):
+        # Same tokens as tokenize, yielded one at a time. source is a string,
+        # a text file object read chunk_size characters at a time, or an
+        # iterable of string chunks; only the unconsumed tail of the current
+        # chunk is held in memory. Bytes raise TypeError: open files in text
+        # mode or decode the chunks first.
+        for code, m, _ in self._scan(source, chunk_size):
+            yield Token(TOKEN_TYPES[code], m.group())
+
+        yield Token(TokenType.EOF, '')
+
+    def _scan(self, source, chunk_size=1 << 16):
+        # The one master-regex loop behind every tokenizer: yields
+        # (type code, match, offset of the matched text in the input) for
+        # every token but whitespace
+        if isinstance(source, str):
+            chunks = iter((source,))
+        elif hasattr(source, 'read'):
+            chunks = iter(lambda: source.read(chunk_size), '')
+        else:
+            chunks = iter(source)
+
+        text = ''
+        offset = 0  # position of text[0] in the whole input
         position = 0
+        exhausted = False
+        match = MASTER_REGEX.match
 
-        while position < len(text):
-            match_found = False
+        while True:
+            length = len(text)
+            m = match(text, position) if position < length else None
 
-            for token_type, pattern in self.token_patterns:
-                regex = re.compile(f'^{pattern}', re.IGNORECASE)
-                match = regex.match(text[position:])
+            # Read on while the match may depend on the next chunk; the
+            # check is inlined for the common case of a match well inside
+            # the buffer
+            if not exhausted and (m is None or m.end() + LOOKAHEAD > length) \
+                    and self._needs_more(m, text, position, length):
+                chunk = next(chunks, None)
+                if chunk is None:
+                    exhausted = True
+                elif not isinstance(chunk, str):
+                    raise TypeError(f"iter_tokens reads text, got a {type(chunk).__name__} chunk")
+                else:
+                    offset += position
+                    text = text[position:] + chunk
+                    position = 0
+                continue
 
-                if match:
-                    value = match.group(0)
+            if position >= length:
+                break
 
-                    if token_type is not None:  # Skip whitespace
-                        self.tokens.append(Token(token_type, value))
+            if m is None:
+                raise ValueError(f"Unrecognized token at position {offset + position}: "
+                                 f"'{text[position:position + 10]}'")
 
-                    position += len(value)
-                    match_found = True
-                    break
+            code = GROUP_CODES[m.lastgroup]
 
-            if not match_found:
-                raise ValueError(f"Unrecognized token at position {position}: '{text[position:position + 10]}'")
+            if code is not None:  # Skip whitespace
+                yield code, m, offset
 
-        self.tokens.append(Token(TokenType.EOF, ''))
-        return self.tokens
+            position = m.end()
+
+    def _needs_more(self, m, text, position, length):
+        if m is not None:
+            return m.end() + LOOKAHEAD > length
+        # Nothing matched: either the buffer is nearly empty or a string
+        # has not been closed yet within the buffered text; anything else
+        # is an unrecognized character and fails without reading on
+        return length - position < LOOKAHEAD or text[position] == '"'
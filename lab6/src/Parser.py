@@ -5,112 +5,153 @@ from StringNode import StringNode
 from TemperatureNode import TemperatureNode
 from TimeNode import TimeNode
 from TitleNode import TitleNode
+from TokenBuffer import TOKEN_TYPES, TokenBuffer
 from TokenType import TokenType
 from UnitNode import UnitNode
 from YeildNode import YieldNode
 from ComponentNode import ComponentNode  # <- Added import
 
-class Parser:
-    def __init__(self, tokens):
-        self.tokens = tokens
-        self.current = 0
+# Integer codes of the token types, as stored in a TokenBuffer
+PROCESS = TokenType.PROCESS.value
+LBRACE = TokenType.LBRACE.value
+RBRACE = TokenType.RBRACE.value
+COLON = TokenType.COLON.value
+SEMICOLON = TokenType.SEMICOLON.value
+STRING = TokenType.STRING.value
+NUMBER = TokenType.NUMBER.value
+UNIT = TokenType.UNIT.value
+TIME_UNIT = TokenType.TIME_UNIT.value
+TEMP_UNIT = TokenType.TEMP_UNIT.value
+EOF = TokenType.EOF.value
 
-    def parse(self):
-        return self.parse_process()
 
-    def parse_process(self):
-        # Expect PROCESS token
-        self.consume(TokenType.PROCESS)
-        self.consume(TokenType.LBRACE)
+class Parser:
+    # Statement keyword -> method parsing the rest of the statement
+    STATEMENTS = {
+        TokenType.TITLE: "parse_title",
+        TokenType.YIELD: "parse_yield",
+        TokenType.TIME: "parse_time",
+        TokenType.COMPONENT: "parse_component",
+        TokenType.STEP: "parse_step",
+        TokenType.TEMP: "parse_temp",
+    }
 
-        # Initialize an empty PROCESS node
+    def __init__(self, tokens):
+        # tokens is a TokenBuffer or any iterable of Token objects, such as
+        # a list from Lexer.tokenize or the generator of Lexer.iter_tokens.
+        # Tokens are pulled one at a time and only the next one is kept.
+        if isinstance(tokens, TokenBuffer):
+            self.stream = tokens.pairs()
+        else:
+            self.stream = ((token.token_type.value, token.value) for token in tokens)
+        self.code, self.value = EOF, ''
+        self.pull()
+        self.handlers = {token_type.value: getattr(self, name) for token_type, name in self.STATEMENTS.items()}
+
+    def pull(self):
+        # Moves the lookahead to the next token; a stream that ends without
+        # an EOF token reads as EOF from then on
+        self.code, self.value = next(self.stream, (EOF, ''))
+
+    def parse(self, on_component=None, on_step=None):
+        return self.parse_process(on_component, on_step)
+
+    def parse_process(self, on_component=None, on_step=None):
+        # Components and steps are passed to on_component/on_step as they
+        # are parsed instead of being collected in the PROCESS node
         process = ProcessNode()
-
-        # Parse process components until we hit the closing brace
-        while not self.check(TokenType.RBRACE) and not self.is_at_end():
-            if self.check(TokenType.TITLE):
-                self.consume(TokenType.TITLE)
-                self.consume(TokenType.COLON)
-                title_value = self.consume(TokenType.STRING).value.strip('"')
-                self.consume(TokenType.SEMICOLON)
-                process.title = TitleNode(StringNode(title_value))
-
-            elif self.check(TokenType.YIELD):
-                self.consume(TokenType.YIELD)
-                self.consume(TokenType.COLON)
-                yield_value = float(self.consume(TokenType.NUMBER).value)
-                self.consume(TokenType.SEMICOLON)
-                process.yield_node = YieldNode(NumberNode(yield_value))
-
-            elif self.check(TokenType.TIME):
-                self.consume(TokenType.TIME)
-                self.consume(TokenType.COLON)
-                time_value = float(self.consume(TokenType.NUMBER).value)
-                time_unit = self.consume(TokenType.TIME_UNIT).value
-                self.consume(TokenType.SEMICOLON)
-                process.time_node = TimeNode(NumberNode(time_value), UnitNode(time_unit))
-
-            elif self.check(TokenType.COMPONENT):  # Changed here
-                self.consume(TokenType.COMPONENT)   # Changed here
-                self.consume(TokenType.COLON)
-
-                quantity = NumberNode(float(self.consume(TokenType.NUMBER).value))
-
-                unit = None
-                if self.check(TokenType.UNIT):
-                    unit = UnitNode(self.consume(TokenType.UNIT).value)
-
-                name = StringNode(self.consume(TokenType.STRING).value.strip('"'))
-                self.consume(TokenType.SEMICOLON)
-
-                process.components.append(ComponentNode(quantity, unit, name))  # Changed here
-
-            elif self.check(TokenType.STEP):
-                self.consume(TokenType.STEP)
-                self.consume(TokenType.COLON)
-                instruction = StringNode(self.consume(TokenType.STRING).value.strip('"'))
-                self.consume(TokenType.SEMICOLON)
-
-                process.steps.append(StepNode(instruction))
-
-            elif self.check(TokenType.TEMP):
-                self.consume(TokenType.TEMP)
-                self.consume(TokenType.COLON)
-                temp_value = NumberNode(float(self.consume(TokenType.NUMBER).value))
-                temp_unit = UnitNode(self.consume(TokenType.TEMP_UNIT).value)
-                self.consume(TokenType.SEMICOLON)
-
-                process.temperature = TemperatureNode(temp_value, temp_unit)
-
+        on_component = on_component or process.components.append
+        on_step = on_step or process.steps.append
+
+        for node in self.iter_statements():
+            if isinstance(node, ComponentNode):
+                on_component(node)
+            elif isinstance(node, StepNode):
+                on_step(node)
+            elif isinstance(node, TitleNode):
+                process.title = node
+            elif isinstance(node, YieldNode):
+                process.yield_node = node
+            elif isinstance(node, TimeNode):
+                process.time_node = node
             else:
-                # Skip unknown tokens
-                self.advance()
-
-        self.consume(TokenType.RBRACE)
+                process.temperature = node
 
         return process
 
-    def advance(self):
-        if not self.is_at_end():
-            self.current += 1
-        return self.previous()
-
-    def consume(self, token_type):
-        if self.check(token_type):
-            return self.advance()
-
-        raise SyntaxError(f"Expected {token_type} but got {self.peek().token_type}")
-
-    def check(self, token_type):
-        if self.is_at_end():
-            return False
-        return self.peek().token_type == token_type
-
-    def is_at_end(self):
-        return self.peek().token_type == TokenType.EOF
-
-    def peek(self):
-        return self.tokens[self.current]
-
-    def previous(self):
-        return self.tokens[self.current - 1]
+    def iter_statements(self):
+        # Yields the node of every statement of the PROCESS block in order,
+        # checking the closing brace once the last one has been taken
+        self.expect(PROCESS)
+        self.expect(LBRACE)
+
+        handlers = self.handlers
+        while True:
+            code = self.code
+            if code == RBRACE or code == EOF:
+                break
+
+            # Unknown tokens are skipped
+            self.pull()
+            handler = handlers.get(code)
+            if handler is not None:
+                yield handler()
+
+        self.expect(RBRACE)
+
+    def parse_title(self):
+        self.expect(COLON)
+        title_value = self.expect(STRING).strip('"')
+        self.expect(SEMICOLON)
+        return TitleNode(StringNode(title_value))
+
+    def parse_yield(self):
+        self.expect(COLON)
+        yield_value = float(self.expect(NUMBER))
+        self.expect(SEMICOLON)
+        return YieldNode(NumberNode(yield_value))
+
+    def parse_time(self):
+        self.expect(COLON)
+        time_value = float(self.expect(NUMBER))
+        time_unit = self.expect(TIME_UNIT)
+        self.expect(SEMICOLON)
+        return TimeNode(NumberNode(time_value), UnitNode(time_unit))
+
+    def parse_component(self):
+        self.expect(COLON)
+
+        quantity = NumberNode(float(self.expect(NUMBER)))
+
+        unit = None
+        if self.code == UNIT:
+            unit = UnitNode(self.expect(UNIT))
+
+        name = StringNode(self.expect(STRING).strip('"'))
+        self.expect(SEMICOLON)
+
+        return ComponentNode(quantity, unit, name)
+
+    def parse_step(self):
+        self.expect(COLON)
+        instruction = StringNode(self.expect(STRING).strip('"'))
+        self.expect(SEMICOLON)
+
+        return StepNode(instruction)
+
+    def parse_temp(self):
+        self.expect(COLON)
+        temp_value = NumberNode(float(self.expect(NUMBER)))
+        temp_unit = UnitNode(self.expect(TEMP_UNIT))
+        self.expect(SEMICOLON)
+
+        return TemperatureNode(temp_value, temp_unit)
+
+    def expect(self, code):
+        # Takes the lookahead if it has the given code; returns its text
+        found = self.code
+        if found != code or found == EOF:
+            raise SyntaxError(f"Expected {TOKEN_TYPES[code]} but got {TOKEN_TYPES[found]}")
+        value = self.value
+        self.pull()
+        return value
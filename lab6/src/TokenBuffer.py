@@ -0,0 +1,35 @@
+from array import array
+
+from TokenType import TokenType
+
+# TokenType.value -> TokenType
+TOKEN_TYPES = {token_type.value: token_type for token_type in TokenType}
+
+
+class TokenBuffer:
+    # Tokens stored as parallel arrays instead of Token objects: the integer
+    # code of each token's type (TokenType.value) and the offsets of its
+    # text in the source, so millions of tokens take a few bytes each.
+
+    def __init__(self, text=""):
+        self.text = text
+        self.types = array('B')
+        self.starts = array('q')
+        self.ends = array('q')
+
+    def append(self, code, start, end):
+        self.types.append(code)
+        self.starts.append(start)
+        self.ends.append(end)
+
+    def __len__(self):
+        return len(self.types)
+
+    def value(self, index):
+        return self.text[self.starts[index]:self.ends[index]]
+
+    def pairs(self):
+        # (code, value) of every token, in order
+        text, starts, ends = self.text, self.starts, self.ends
+        for index, code in enumerate(self.types):
+            yield code, text[starts[index]:ends[index]]
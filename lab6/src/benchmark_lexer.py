@@ -0,0 +1,52 @@
+import sys
+import time
+
+from Lexer import Lexer
+
+PROCESS_HEADER = """
+PROCESS {
+    TITLE: "Mass Production of Sedan Model X";
+    YIELD: 1000;
+    TIME: 30 days;
+    TEMP: 180 C;
+"""
+
+PROCESS_BODY = """    COMPONENT: 1000 "chassis frames";
+    COMPONENT: 2000 g "body panels";
+    STEP: "Weld panels and chassis into body-in-white";
+    STEP: "Bake in paint oven at 180 C for 45 minutes";
+"""
+
+PROCESS_FOOTER = "}\n"
+
+
+def generate_process(size_bytes):
+    repeats = max(1, (size_bytes - len(PROCESS_HEADER) - len(PROCESS_FOOTER)) // len(PROCESS_BODY))
+    return PROCESS_HEADER + PROCESS_BODY * repeats + PROCESS_FOOTER
+
+
+def benchmark(sizes_mb):
+    lexer = Lexer()
+    print(f"{'size (MB)':>10} {'tokens':>12} {'seconds':>10} {'MB/s':>8} {'s/MB':>8}")
+
+    for size_mb in sizes_mb:
+        text = generate_process(int(size_mb * 1024 * 1024))
+
+        start = time.perf_counter()
+        tokens = lexer.tokenize(text)
+        elapsed = time.perf_counter() - start
+
+        actual_mb = len(text) / (1024 * 1024)
+        print(f"{actual_mb:>10.1f} {len(tokens):>12} {elapsed:>10.2f} "
+              f"{actual_mb / elapsed:>8.2f} {elapsed / actual_mb:>8.3f}")
+
+        # Release the token list before building the next input
+        lexer.tokens = []
+        del tokens, text
+
+
+if __name__ == '__main__':
+    # Sizes in MB, e.g. `python benchmark_lexer.py 1 10 100`.
+    # A constant s/MB column across sizes means the tokenizer scales linearly.
+    sizes = [float(arg) for arg in sys.argv[1:]] or [1, 10, 100]
+    benchmark(sizes)
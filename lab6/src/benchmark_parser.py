@@ -0,0 +1,78 @@
+import sys
+import time
+import tracemalloc
+
+from Lexer import Lexer
+from Parser import Parser
+from benchmark_lexer import PROCESS_BODY, PROCESS_FOOTER, PROCESS_HEADER
+
+# PROCESS_BODY holds two COMPONENT and two STEP statements
+ENTRIES_PER_BODY = 4
+
+
+def generate_entries(entry_count):
+    return PROCESS_HEADER + PROCESS_BODY * max(1, entry_count // ENTRIES_PER_BODY) + PROCESS_FOOTER
+
+
+def generate_chunks(entry_count):
+    # Same text as generate_entries, one PROCESS_BODY at a time
+    yield PROCESS_HEADER
+    for _ in range(max(1, entry_count // ENTRIES_PER_BODY)):
+        yield PROCESS_BODY
+    yield PROCESS_FOOTER
+
+
+def benchmark(entry_counts):
+    lexer = Lexer()
+    print(f"{'entries':>9} {'tokens':>10} {'lex s':>7} {'parse s':>8} {'statements/s':>13}")
+
+    for entry_count in entry_counts:
+        text = generate_entries(entry_count)
+
+        start = time.perf_counter()
+        tokens = lexer.tokenize_buffer(text)
+        lex_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        process = Parser(tokens).parse()
+        parse_time = time.perf_counter() - start
+
+        statements = len(process.components) + len(process.steps) + 4
+        print(f"{statements - 4:>9} {len(tokens):>10} {lex_time:>7.2f} {parse_time:>8.2f} "
+              f"{statements / parse_time:>13.0f}")
+
+        del text, tokens, process
+
+
+def benchmark_stream(entry_counts):
+    # Lexes and parses in one pass, counting entries through the callbacks.
+    # Peak memory should stay flat as the entry count grows.
+    lexer = Lexer()
+    print(f"{'entries':>9} {'seconds':>8} {'statements/s':>13} {'peak KiB':>9}")
+
+    for entry_count in entry_counts:
+        counts = [0]
+
+        def count(node):
+            counts[0] += 1
+
+        start = time.perf_counter()
+        Parser(lexer.iter_tokens(generate_chunks(entry_count))).parse(count, count)
+        elapsed = time.perf_counter() - start
+
+        # Second pass under tracemalloc, which slows it down several times
+        tracemalloc.start()
+        Parser(lexer.iter_tokens(generate_chunks(entry_count))).parse(count, count)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        entries = counts[0] // 2
+        print(f"{entries:>9} {elapsed:>8.2f} {(entries + 4) / elapsed:>13.0f} {peak / 1024:>9.1f}")
+
+if __name__ == '__main__':
+    # STEP/COMPONENT entry counts, e.g. `python benchmark_parser.py 10000 1000000`;
+    # --stream lexes and parses lazily instead of building a TokenBuffer first
+    args = sys.argv[1:]
+    stream = '--stream' in args
+    counts = [int(arg) for arg in args if arg != '--stream'] or [10000, 100000, 1000000]
+    (benchmark_stream if stream else benchmark)(counts)
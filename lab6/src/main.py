@@ -38,7 +38,8 @@ for token in tokens:
     print(token)
 print()
 
-Parser = Parser(tokens)
+# The parser pulls tokens from the lexer one at a time
+Parser = Parser(Lexer.iter_tokens(test_process))
 process_ast = Parser.parse()
 
 print("Abstract Syntax Tree:")